@@ -1,12 +1,11 @@
 """
 Utility script to move old threads to archive folder
 """
-import json
 import shutil
-from pathlib import Path
 from datetime import datetime
-from dateutil import parser
 import config
+from utils import load_json, parse_end_date
+
 
 def archive_old_threads():
     """Move threads older than ARCHIVE_THRESHOLD_DAYS to archive folder"""
@@ -15,6 +14,7 @@ def archive_old_threads():
     
     threads_moved = 0
     errors = 0
+    now = datetime.now()
     
     # Scan all thread folders
     for thread_folder in config.THREADS_DIR.iterdir():
@@ -28,8 +28,7 @@ def archive_old_threads():
                 print(f"  ⚠️  No metadata found for {thread_folder.name}")
                 continue
             
-            with open(metadata_file, 'r', encoding='utf-8') as f:
-                metadata = json.load(f)
+            metadata = load_json(metadata_file)
             
             # Check end date
             end_date_str = metadata.get('end_date')
@@ -38,8 +37,8 @@ def archive_old_threads():
                 continue
             
             # Parse date
-            end_date = parser.parse(end_date_str)
-            days_since_last = (datetime.now() - end_date.replace(tzinfo=None)).days
+            end_date = parse_end_date(end_date_str)
+            days_since_last = (now - end_date.replace(tzinfo=None)).days
             
             # Check if should archive
             if days_since_last > config.ARCHIVE_THRESHOLD_DAYS:
@@ -30,6 +30,8 @@ ARCHIVE_THRESHOLD_DAYS = 60  # Archive threads older than this (2 months)
 # First run will download model (~500MB), then cached locally
 USE_AI_SUMMARIZATION = True  # Set to False to use only rule-based summaries
 AI_MODEL = "sshleifer/distilbart-cnn-12-6"  # Smaller, faster model
+AI_MIN_INPUT_CHARS = 400  # Shorter threads get a rule-based summary instead
+AI_MIN_EMAILS = 3  # Threads with fewer emails get a rule-based summary instead
 
 # Logging
 LOG_FILE = LOGS_DIR / "thread_manager.log"
@@ -43,7 +45,12 @@ KEYWORDS_CUSTOMS = ["customs", "carinska", "border", "clearance"]
 
 # Timeline Configuration
 TIMELINE_DATE_FORMAT = "%Y-%m-%d %H:%M"
-TIMELINE_OUTPUT_FORMAT = "png"  # or "html" for interactive
+TIMELINE_OUTPUT_FORMAT = "png"  # "png", "svg" (vector, fastest to write) or "html" for interactive
+TIMELINE_FAST_RENDER = False  # True: Agg backend, 120 DPI PNGs without tight cropping (faster, lower quality than 300 DPI)
+TIMELINE_PLOTLYJS = "cdn"  # How HTML timelines load plotly.js: "cdn" (needs internet) or True to embed it (~3.5MB per file)
+
+# Dashboard
+DASHBOARD_MAX_THREADS = 200  # Render cards for only the highest-priority threads (None for all)
 
 # Developer Mode
 DEVELOPER_MODE = True  # Skip prompts, auto-confirm, use defaults
@@ -60,4 +67,5 @@ EXCEL_FILE = OUTPUT_DIR / "thread_summary.xlsx"
 # Thread Metadata
 METADATA_FILE_NAME = "thread_metadata.json"
 SUMMARY_FILE_NAME = "thread_summary.md"
-TIMELINE_FILE_NAME = "timeline"  # .png or .html will be added
+TIMELINE_FILE_NAME = "timeline"  # .png, .svg or .html will be added
+METADATA_LOAD_WORKERS = min(32, (os.cpu_count() or 1) + 4)  # Threads reading thread folders concurrently (I/O-bound)
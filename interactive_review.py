@@ -1,14 +1,18 @@
 """
 Interactive Review Mode - Present threads and create drafts
 """
-import json
 import logging
+import re
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional
 import config
+from utils import load_folder_metadata, map_thread_folders
 
 logger = logging.getLogger(__name__)
 
+# Score from the summary's priority heading, e.g. "## 🟠 Priority: High (60/100)"
+_PRIORITY_SCORE_RE = re.compile(r'Priority:[^\n]*?\(\s*(\d+)\s*/')
+
 
 class InteractiveReviewer:
     """Interactive review of threads requiring attention"""
@@ -72,69 +76,68 @@ class InteractiveReviewer:
     
     def _load_thread_summaries(self, threads_dir: Path) -> List[Dict]:
         """Load all thread summaries from disk"""
-        threads = []
-        
-        for thread_folder in threads_dir.iterdir():
-            if not thread_folder.is_dir():
-                continue
+        return map_thread_folders(threads_dir, self._load_thread_summary)
+    
+    def _load_thread_summary(self, thread_folder: Path) -> Optional[Dict]:
+        """Load one thread folder's summary, or None if it is not a thread folder"""
+        try:
+            metadata = load_folder_metadata(thread_folder)
+            if metadata is None:
+                return None
             
-            try:
-                # Load metadata
-                metadata_file = thread_folder / config.METADATA_FILE_NAME
-                if not metadata_file.exists():
-                    continue
-                
-                with open(metadata_file, 'r', encoding='utf-8') as f:
-                    metadata = json.load(f)
-                
-                # Load summary markdown
-                summary_file = thread_folder / config.SUMMARY_FILE_NAME
-                summary_text = ""
-                if summary_file.exists():
-                    with open(summary_file, 'r', encoding='utf-8') as f:
-                        summary_text = f.read()
-                
-                # Extract priority and reply template from summary
+            # Triage fields are saved with the metadata; older folders only have them
+            # in the summary markdown
+            summary_text = None
+            priority_score = metadata.get('priority_score')
+            response_needed = metadata.get('response_needed')
+            if priority_score is None or response_needed is None:
+                summary_text = self._read_summary_text(thread_folder)
                 priority_score = self._extract_priority_score(summary_text)
-                reply_template = self._extract_reply_template(summary_text)
                 response_needed = 'Response Needed' in summary_text
-                
-                # Determine if requires attention
-                requires_attention = (
-                    priority_score >= 40 or  # Medium+ priority
-                    response_needed or
-                    metadata.get('is_urgent', False)
-                )
-                
-                threads.append({
-                    'folder': thread_folder,
-                    'name': metadata.get('thread_name', thread_folder.name),
-                    'metadata': metadata,
-                    'summary_text': summary_text,
-                    'priority_score': priority_score,
-                    'reply_template': reply_template,
-                    'response_needed': response_needed,
-                    'requires_attention': requires_attention
-                })
             
-            except Exception as e:
-                logger.error(f"Error loading thread {thread_folder.name}: {e}")
-                continue
+            # Determine if requires attention
+            requires_attention = (
+                priority_score >= 40 or  # Medium+ priority
+                response_needed or
+                metadata.get('is_urgent', False)
+            )
+            
+            # Summary text and reply templates are only used for threads shown in the review
+            if requires_attention:
+                if summary_text is None:
+                    summary_text = self._read_summary_text(thread_folder)
+                reply_template = self._extract_reply_template(summary_text)
+            else:
+                summary_text = summary_text or ""
+                reply_template = ""
+            
+            return {
+                'folder': thread_folder,
+                'name': metadata.get('thread_name', thread_folder.name),
+                'metadata': metadata,
+                'summary_text': summary_text,
+                'priority_score': priority_score,
+                'reply_template': reply_template,
+                'response_needed': response_needed,
+                'requires_attention': requires_attention
+            }
         
-        return threads
+        except Exception as e:
+            logger.error(f"Error loading thread {thread_folder.name}: {e}")
+            return None
+    
+    def _read_summary_text(self, thread_folder: Path) -> str:
+        """Read a thread's summary markdown ("" if it has none)"""
+        try:
+            with open(thread_folder / config.SUMMARY_FILE_NAME, 'r', encoding='utf-8') as f:
+                return f.read()
+        except FileNotFoundError:
+            return ""
     
     def _extract_priority_score(self, summary_text: str) -> int:
         """Extract priority score from summary"""
-        try:
-            if 'Priority:' in summary_text:
-                # Find line like "## 🟠 Priority: High (60/100)"
-                for line in summary_text.split('\n'):
-                    if 'Priority:' in line and '(' in line:
-                        score_part = line.split('(')[1].split('/')[0]
-                        return int(score_part)
-        except:
-            pass
-        return 0
+        match = _PRIORITY_SCORE_RE.search(summary_text)
+        return int(match.group(1)) if match else 0
     
     def _extract_reply_template(self, summary_text: str) -> str:
         """Extract reply template from summary"""
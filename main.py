@@ -3,15 +3,16 @@ Transport Thread Manager - Main Application
 Automatically organizes, analyzes, and visualizes email threads for transport coordination
 """
 import logging
-import json
 from pathlib import Path
 from datetime import datetime
+from operator import itemgetter
 import config
 from outlook_thread_manager import OutlookThreadManager
 from thread_summarizer import ThreadSummarizer
-from timeline_generator import TimelineGenerator
+from timeline_generator import TimelineGenerator, TimelineBatch
 from dashboard_generator import DashboardGenerator
 from interactive_review import InteractiveReviewer
+from utils import load_folder_metadata, map_thread_folders, save_thread_metadata, parse_end_date
 
 # Configure logging
 logging.basicConfig(
@@ -37,7 +38,10 @@ class TransportThreadManager:
         
         self.outlook_manager = OutlookThreadManager()
         self.summarizer = ThreadSummarizer()
-        self.timeline_generator = TimelineGenerator()
+        self.timeline_generator = TimelineGenerator(
+            use_interactive=config.TIMELINE_OUTPUT_FORMAT == "html",
+            fast_render=config.TIMELINE_FAST_RENDER
+        )
         self.dashboard = DashboardGenerator()
         
         # Statistics
@@ -49,6 +53,9 @@ class TransportThreadManager:
             'timelines_created': 0,
             'errors': 0
         }
+        
+        # Timelines render in worker processes while later threads are processed
+        self._timelines = None
     
     def run(self, min_emails: int = None, process_threads: bool = True):
         """
@@ -72,6 +79,7 @@ class TransportThreadManager:
             logger.info(f"Found {len(threads)} threads to process")
             
             # Step 2: Process each thread
+            self._timelines = TimelineBatch(self.timeline_generator)
             for i, (conv_id, thread_emails) in enumerate(threads.items(), 1):
                 try:
                     logger.info(f"\n--- Processing Thread {i}/{len(threads)} ---")
@@ -88,6 +96,8 @@ class TransportThreadManager:
                     self.stats['errors'] += 1
                     continue
             
+            self._finish_timelines()
+            
             # Step 3: Generate summary report
             self._generate_summary_report()
             
@@ -105,7 +115,10 @@ class TransportThreadManager:
             logger.error(f"Fatal error in main execution: {e}")
             raise
         finally:
-            self.outlook_manager.cleanup()
+            try:
+                self._cancel_timelines()
+            finally:
+                self.outlook_manager.cleanup()
     
     def run_existing_threads(self):
         """Process existing threads from the Threads folder"""
@@ -122,6 +135,7 @@ class TransportThreadManager:
             logger.info(f"Found {len(threads)} existing threads to reprocess")
             
             # Process each thread
+            self._timelines = TimelineBatch(self.timeline_generator)
             for i, (folder_name, thread_emails) in enumerate(threads.items(), 1):
                 try:
                     logger.info(f"\n--- Reprocessing Thread {i}/{len(threads)} ---")
@@ -133,6 +147,8 @@ class TransportThreadManager:
                     self.stats['errors'] += 1
                     continue
             
+            self._finish_timelines()
+            
             # Generate summary report
             self._generate_summary_report()
             
@@ -149,6 +165,8 @@ class TransportThreadManager:
         except Exception as e:
             logger.error(f"Fatal error in reprocessing: {e}")
             raise
+        finally:
+            self._cancel_timelines()
     
     def _process_thread(self, conv_id: str, thread_emails: list):
         """Process a single thread (move, summarize, visualize)"""
@@ -164,10 +182,7 @@ class TransportThreadManager:
             
             # Check if thread should be archived (>2 months old)
             # Convert end_date from ISO string to datetime if needed
-            end_date = metadata['end_date']
-            if isinstance(end_date, str):
-                from dateutil import parser
-                end_date = parser.parse(end_date)
+            end_date = parse_end_date(metadata['end_date'])
             
             days_since_last = (datetime.now() - end_date.replace(tzinfo=None)).days
             should_archive = days_since_last > config.ARCHIVE_THRESHOLD_DAYS
@@ -213,20 +228,12 @@ class TransportThreadManager:
             
             # Save metadata as JSON
             metadata_file = local_folder / config.METADATA_FILE_NAME
-            with open(metadata_file, 'w', encoding='utf-8') as f:
-                # Convert datetime objects to strings for JSON serialization
-                metadata_json = metadata.copy()
-                metadata_json['start_date'] = str(metadata_json['start_date'])
-                metadata_json['end_date'] = str(metadata_json['end_date'])
-                json.dump(metadata_json, f, indent=2, ensure_ascii=False)
+            save_thread_metadata(metadata_file, metadata, summary)
             logger.info(f"Metadata saved to {metadata_file}")
             
-            # Generate timeline
-            logger.info("Generating timeline visualization...")
+            # Render timeline in a worker process while the next thread is processed
             timeline_path = str(local_folder / config.TIMELINE_FILE_NAME)
-            if self.timeline_generator.generate_timeline(thread_emails, summary, timeline_path):
-                self.stats['timelines_created'] += 1
-                logger.info(f"Timeline saved to {timeline_path}")
+            self._timelines.submit(thread_emails, summary, timeline_path)
             
             logger.info(f"✓ Thread processed successfully: {thread_name}")
             
@@ -272,10 +279,7 @@ class TransportThreadManager:
             logger.info(f"  - Duration: {metadata['duration_days']} days")
             
             # Check if thread should be archived (>60 days old)
-            end_date = metadata['end_date']
-            if isinstance(end_date, str):
-                from dateutil import parser
-                end_date = parser.parse(end_date)
+            end_date = parse_end_date(metadata['end_date'])
             days_since_last = (datetime.now() - end_date.replace(tzinfo=None)).days
             should_archive = days_since_last > config.ARCHIVE_THRESHOLD_DAYS
             
@@ -300,23 +304,36 @@ class TransportThreadManager:
             
             # Save metadata as JSON
             metadata_file = local_folder / config.METADATA_FILE_NAME
-            with open(metadata_file, 'w', encoding='utf-8') as f:
-                metadata_json = metadata.copy()
-                metadata_json['start_date'] = str(metadata_json['start_date'])
-                metadata_json['end_date'] = str(metadata_json['end_date'])
-                json.dump(metadata_json, f, indent=2, ensure_ascii=False)
+            save_thread_metadata(metadata_file, metadata, summary)
             logger.info(f"Metadata saved to {metadata_file}")
             
-            # Generate timeline
-            logger.info("Generating timeline...")
+            # Render timeline in a worker process while the next thread is processed
             timeline_path = str(local_folder / "timeline")
-            if self.timeline_generator.generate_timeline(thread_emails, summary, timeline_path):
-                logger.info(f"Timeline saved")
-                self.stats['timelines_created'] += 1
+            self._timelines.submit(thread_emails, summary, timeline_path)
             
         except Exception as e:
             logger.error(f"Error analyzing existing thread: {e}", exc_info=True)
     
+    def _finish_timelines(self):
+        """Wait for the timelines still rendering and count the ones saved"""
+        if self._timelines is None:
+            return
+        
+        results = self._timelines.close()
+        self._timelines = None
+        if results:
+            self.stats['timelines_created'] += sum(results)
+            logger.info(f"Timelines saved: {sum(results)}/{len(results)}")
+    
+    def _cancel_timelines(self):
+        """Stop timelines left rendering by an interrupt or fatal error, without waiting"""
+        if self._timelines is None:
+            return
+        
+        results = self._timelines.cancel()
+        self._timelines = None
+        logger.warning(f"Timeline rendering cancelled: {sum(results)}/{len(results)} saved")
+    
     def _create_local_thread_folder(self, conv_id: str, thread_name: str, archive: bool = False) -> Path:
         """Create local folder for thread outputs"""
         # Clean folder name
@@ -336,14 +353,7 @@ class TransportThreadManager:
             logger.info("\nGenerating summary report...")
             
             # Collect all thread metadata
-            all_threads = []
-            for thread_folder in config.THREADS_DIR.iterdir():
-                if thread_folder.is_dir():
-                    metadata_file = thread_folder / config.METADATA_FILE_NAME
-                    if metadata_file.exists():
-                        with open(metadata_file, 'r', encoding='utf-8') as f:
-                            metadata = json.load(f)
-                            all_threads.append(metadata)
+            all_threads = map_thread_folders(config.THREADS_DIR, load_folder_metadata)
             
             if not all_threads:
                 logger.info("No threads to report")
@@ -383,7 +393,7 @@ class TransportThreadManager:
                 # All threads summary
                 f.write(f"\nALL THREADS:\n")
                 f.write("-" * 80 + "\n")
-                for i, thread in enumerate(sorted(all_threads, key=lambda x: x['start_date'], reverse=True), 1):
+                for i, thread in enumerate(sorted(all_threads, key=itemgetter('start_date'), reverse=True), 1):
                     f.write(f"{i}. {thread['thread_name']}\n")
                     f.write(f"   Emails: {thread['email_count']} | "
                            f"Participants: {thread['participant_count']} | "
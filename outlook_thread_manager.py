@@ -5,13 +5,19 @@ Handles connection to Outlook, thread detection, and organization
 import win32com.client
 import pythoncom
 import logging
-from datetime import datetime
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict
 from collections import defaultdict
+from operator import itemgetter
 import config
 
 logger = logging.getLogger(__name__)
 
+# Characters Outlook does not allow in folder names, mapped to '_' in one translate pass
+_INVALID_FOLDER_CHARS = str.maketrans(dict.fromkeys('/\\:*?"<>|', '_'))
+
+# Reply/forward prefixes stripped from thread subjects
+_SUBJECT_PREFIXES = ('RE:', 'FW:', 'FWD:', 'Re:', 'Fw:', 'Fwd:')
+
 
 class OutlookThreadManager:
     """Manages Outlook email threads for transport coordination"""
@@ -22,6 +28,7 @@ class OutlookThreadManager:
         self.namespace = None
         self.inbox = None
         self.threads_folder = None
+        self.archive_folder = None  # Looked up on first archived thread
         self._initialize_outlook()
     
     def _initialize_outlook(self):
@@ -196,9 +203,10 @@ class OutlookThreadManager:
             
             # Determine parent folder (Threads or Archive)
             if archive:
-                # Get or create Archive folder
-                archive_folder = self._get_or_create_folder(self.inbox, config.ARCHIVE_FOLDER_NAME)
-                parent_folder = archive_folder
+                # Get or create Archive folder once, not per archived thread
+                if self.archive_folder is None:
+                    self.archive_folder = self._get_or_create_folder(self.inbox, config.ARCHIVE_FOLDER_NAME)
+                parent_folder = self.archive_folder
             else:
                 parent_folder = self.threads_folder
             
@@ -216,11 +224,7 @@ class OutlookThreadManager:
     
     def _clean_folder_name(self, name: str) -> str:
         """Clean folder name by removing invalid characters"""
-        invalid_chars = ['/', '\\', ':', '*', '?', '"', '<', '>', '|']
-        clean_name = name
-        for char in invalid_chars:
-            clean_name = clean_name.replace(char, '_')
-        return clean_name.strip()
+        return name.translate(_INVALID_FOLDER_CHARS).strip()
     
     def generate_thread_name(self, thread_emails: List[Dict]) -> str:
         """
@@ -239,9 +243,8 @@ class OutlookThreadManager:
         first_subject = thread_emails[0]['subject']
         
         # Remove common prefixes
-        prefixes = ['RE:', 'FW:', 'FWD:', 'Re:', 'Fw:', 'Fwd:']
         clean_subject = first_subject
-        for prefix in prefixes:
+        for prefix in _SUBJECT_PREFIXES:
             clean_subject = clean_subject.replace(prefix, '').strip()
         
         # Get date range
@@ -267,7 +270,7 @@ class OutlookThreadManager:
             return {}
         
         # Sort by date
-        sorted_emails = sorted(thread_emails, key=lambda x: x['received_time'])
+        sorted_emails = sorted(thread_emails, key=itemgetter('received_time'))
         
         # Extract participants
         participants = set()
@@ -287,8 +290,8 @@ class OutlookThreadManager:
             except:
                 pass
         
-        # Analyze subject for keywords
-        all_text = " ".join([email['subject'] + " " + email['body'] for email in thread_emails])
+        # Analyze subject for keywords; lowercase the combined text once, not per keyword
+        all_text = " ".join([email['subject'] + " " + email['body'] for email in thread_emails]).lower()
         
         metadata = {
             'conversation_id': thread_emails[0]['conversation_id'],
@@ -300,10 +303,10 @@ class OutlookThreadManager:
             'end_date': end_date.isoformat(),
             'duration_days': duration,
             'total_attachments': total_attachments,
-            'is_urgent': any(keyword in all_text.lower() for keyword in config.KEYWORDS_URGENT),
-            'has_delay': any(keyword in all_text.lower() for keyword in config.KEYWORDS_DELAY),
-            'is_transport': any(keyword in all_text.lower() for keyword in config.KEYWORDS_TRANSPORT),
-            'is_customs': any(keyword in all_text.lower() for keyword in config.KEYWORDS_CUSTOMS),
+            'is_urgent': any(keyword in all_text for keyword in config.KEYWORDS_URGENT),
+            'has_delay': any(keyword in all_text for keyword in config.KEYWORDS_DELAY),
+            'is_transport': any(keyword in all_text for keyword in config.KEYWORDS_TRANSPORT),
+            'is_customs': any(keyword in all_text for keyword in config.KEYWORDS_CUSTOMS),
         }
         
         return metadata
@@ -0,0 +1,84 @@
+"""
+Tests for the HTML dashboard's statistics and card cap
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+import config
+from dashboard_generator import DashboardGenerator
+
+
+def _make_summary(name: str, score: int, level: str, **metadata):
+    """Build the parts of a thread summary the dashboard reads"""
+    return {
+        'thread_name': name,
+        'metadata': {'email_count': 3, 'participant_count': 2, 'duration_days': 1, **metadata},
+        'priority': {'score': score, 'priority': level, 'factors': []},
+        'conversation_insights': {'response_needed': score >= 50, 'next_action': "Review"},
+    }
+
+
+def _build_dashboard() -> DashboardGenerator:
+    """Five active threads with distinct scores plus one archived thread"""
+    dashboard = DashboardGenerator()
+    dashboard.add_thread(_make_summary("thread_low", 10, 'Low'))
+    dashboard.add_thread(_make_summary("thread_critical", 90, 'Critical', is_urgent=True))
+    dashboard.add_thread(_make_summary("thread_medium", 40, 'Medium', has_delay=True))
+    dashboard.add_thread(_make_summary("thread_high", 60, 'High'))
+    dashboard.add_thread(_make_summary("thread_lowest", 5, 'Low'))
+    dashboard.add_thread(_make_summary("thread_archived", 95, 'Critical', is_urgent=True), is_archived=True)
+    return dashboard
+
+
+def _render(dashboard: DashboardGenerator, max_threads) -> str:
+    """Generate the dashboard with a card cap and return its HTML"""
+    original = config.DASHBOARD_MAX_THREADS
+    config.DASHBOARD_MAX_THREADS = max_threads
+    try:
+        with tempfile.TemporaryDirectory() as folder:
+            output_path = Path(folder) / "dashboard.html"
+            assert dashboard.generate_html(output_path)
+            return output_path.read_text(encoding='utf-8')
+    finally:
+        config.DASHBOARD_MAX_THREADS = original
+
+
+def test_statistics_count_active_threads_only():
+    """Running counts skip archived threads"""
+    dashboard = _build_dashboard()
+    
+    assert dashboard.active_counts == {'response_needed': 2, 'critical': 1, 'high': 1, 'urgent': 1, 'delay': 1}
+
+
+def test_dashboard_caps_cards_by_priority():
+    """Only the highest-priority cards are rendered once the cap is exceeded"""
+    html = _render(_build_dashboard(), max_threads=3)
+    
+    assert "Top 3 of 5 Threads" in html
+    assert html.count('<div class="thread-card">') == 3
+    for name in ("thread_critical", "thread_high", "thread_medium"):
+        assert name in html
+    for name in ("thread_low", "thread_lowest", "thread_archived"):
+        assert name not in html
+    assert html.index("thread_critical") < html.index("thread_high") < html.index("thread_medium")
+
+
+def test_dashboard_without_cap_renders_all_threads():
+    """Below the cap (or with no cap) every active thread gets a card"""
+    for max_threads in (None, 5):
+        html = _render(_build_dashboard(), max_threads)
+        
+        assert "All Threads" in html
+        assert html.count('<div class="thread-card">') == 5
+
+
+if __name__ == "__main__":
+    for test in (test_statistics_count_active_threads_only, test_dashboard_caps_cards_by_priority,
+                 test_dashboard_without_cap_renders_all_threads):
+        test()
+        print(f"✓ {test.__name__}")
@@ -0,0 +1,112 @@
+"""
+Regression tests for rule-based thread analysis
+"""
+import os
+import sys
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from thread_summarizer import ThreadSummarizer
+
+NOW = datetime(2025, 10, 21, 12, 0)
+
+
+def _make_emails(*bodies: str):
+    """Build a chronological thread with one email per body"""
+    return [
+        {
+            'subject': 'Truck delivery',
+            'sender': f"Sender {i}",
+            'received_time': NOW - timedelta(days=len(bodies) - i),
+            'body': body,
+        }
+        for i, body in enumerate(bodies)
+    ]
+
+
+def _insights(summarizer: ThreadSummarizer, *bodies: str):
+    """Run conversation insight extraction on a thread"""
+    emails = _make_emails(*bodies)
+    analyzed = summarizer._analyze_emails(emails)
+    return summarizer._extract_conversation_insights(emails, analyzed, NOW)
+
+
+def test_waiting_on_uses_phrase_priority():
+    """'waiting for' wins over a 'pending' that appears earlier in the body"""
+    summarizer = ThreadSummarizer(use_ai=False)
+    
+    insights = _insights(summarizer, "The shipment is pending at the border. We are waiting for the driver")
+    
+    assert insights['waiting_on'] == "Check email: waiting for the driver..."
+    assert insights['next_action'] == "Waiting on external party"
+
+
+def test_waiting_on_falls_back_to_later_phrases():
+    """Lower-priority phrases are still found when no earlier phrase appears"""
+    summarizer = ThreadSummarizer(use_ai=False)
+    
+    insights = _insights(summarizer, "Documents are awaiting signature")
+    
+    assert insights['waiting_on'] == "Check email: awaiting signature..."
+    
+    insights = _insights(summarizer, "Truck arrived on time")
+    
+    assert insights['waiting_on'] is None
+
+
+def _issues(summarizer: ThreadSummarizer, *bodies: str):
+    """Run issue extraction on a thread"""
+    emails = _make_emails(*bodies)
+    return summarizer._extract_issues(emails, summarizer._analyze_emails(emails))
+
+
+def test_issue_is_earliest_keyword_hit():
+    """An email's issue is its earliest keyword hit, not its first keyword in list order"""
+    summarizer = ThreadSummarizer(use_ai=False)
+    
+    # Keyword-list order would pick 'late' (a delay keyword) over 'problem'
+    issues = _issues(summarizer, "There is a problem with the papers. The truck is late")
+    
+    assert issues == ["[2025-10-20] There is a problem with the papers"]
+
+
+def test_issue_skips_long_sentences():
+    """A keyword found only in a long sentence no longer hides a later short issue sentence"""
+    summarizer = ThreadSummarizer(use_ai=False)
+    long_sentence = "The truck will be late because " + "the route is blocked and " * 10
+    
+    issues = _issues(summarizer, f"{long_sentence}. One pallet is missing")
+    
+    assert issues == ["[2025-10-20] One pallet is missing"]
+
+
+def test_priority_score_from_emails_and_metadata():
+    """Priority is scored from the sorted emails, their analysis, the metadata and 'now'"""
+    summarizer = ThreadSummarizer(use_ai=False)
+    emails = _make_emails("Truck left the warehouse", "Please confirm the delivery slot")
+    analyzed = summarizer._analyze_emails(emails)
+    metadata = {'is_urgent': True, 'has_delay': False, 'participant_count': 2, 'email_count': 2,
+                'is_customs': False, 'is_transport': True}
+    
+    priority = summarizer._calculate_priority_score(emails, analyzed, metadata, NOW)
+    
+    # Urgent (30) + response needed (25) + recent (20) + transport (5)
+    assert priority['score'] == 80
+    assert priority['priority'] == 'Critical'
+    
+    # The same thread seen ten days later has lost its recency bonus
+    priority = summarizer._calculate_priority_score(emails, analyzed, metadata, NOW + timedelta(days=10))
+    
+    assert priority['score'] == 50
+    assert priority['priority'] == 'High'
+    assert summarizer._calculate_priority_score([], [], metadata, NOW) == {'score': 0, 'priority': 'Low', 'factors': []}
+
+
+if __name__ == "__main__":
+    for test in (test_waiting_on_uses_phrase_priority, test_waiting_on_falls_back_to_later_phrases,
+                 test_issue_is_earliest_keyword_hit, test_issue_skips_long_sentences,
+                 test_priority_score_from_emails_and_metadata):
+        test()
+        print(f"✓ {test.__name__}")
@@ -0,0 +1,147 @@
+"""
+Tests for rendering timelines in worker processes (TimelineBatch)
+"""
+import os
+import sys
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from timeline_generator import TimelineGenerator, TimelineBatch
+
+
+class _CrashWorker:
+    """Unpickling this in a worker process kills the worker"""
+    def __reduce__(self):
+        return (os._exit, (1,))
+
+
+class _InterruptWorker:
+    """Rendering a title with this raises KeyboardInterrupt inside the worker"""
+    def __format__(self, format_spec):
+        raise KeyboardInterrupt
+    
+    __str__ = __format__
+
+
+def _make_job(output_dir: str, name: str, **summary_extra):
+    """Build a (thread_emails, summary, output_path) job for a three-email thread"""
+    start = datetime(2025, 10, 1, 9, 0)
+    thread_emails = [
+        {
+            'subject': f"{name} update {i}",
+            'sender': f"Sender {i % 2}",
+            'received_time': start + timedelta(hours=i),
+            'body': f"Dear all,\nTruck {i} is on the way.\nBest regards",
+            'email': threading.Lock(),  # Stands in for the unpicklable Outlook COM item
+        }
+        for i in range(3)
+    ]
+    summary = {
+        'thread_name': name,
+        'metadata': {'email_count': 3, 'participant_count': 2, 'duration_days': 0, 'total_attachments': 0},
+        **summary_extra
+    }
+    return thread_emails, summary, str(Path(output_dir) / name)
+
+
+def _rendered(output_dir: str, name: str) -> bool:
+    """Whether a timeline file (.png, .svg, .html or the .txt fallback) was written for a job"""
+    return any(Path(output_dir).glob(f"{name}.*"))
+
+
+def _render_in_process_recorder(generator: TimelineGenerator) -> list:
+    """Record the output paths the batch falls back to rendering in-process"""
+    calls = []
+    render = generator.generate_timeline
+    
+    def record(thread_emails, summary, output_path):
+        calls.append(Path(output_path).name)
+        return render(thread_emails, summary, output_path)
+    
+    generator.generate_timeline = record
+    return calls
+
+
+def test_batch_renders_on_pool():
+    """Every job is rendered by a worker process"""
+    generator = TimelineGenerator()
+    in_process = _render_in_process_recorder(generator)
+    
+    with tempfile.TemporaryDirectory() as output_dir:
+        batch = TimelineBatch(generator, max_workers=2)
+        for name in ('thread_a', 'thread_b', 'thread_c'):
+            batch.submit(*_make_job(output_dir, name))
+        results = batch.close()
+        
+        assert results == [True, True, True]
+        assert in_process == []
+        for name in ('thread_a', 'thread_b', 'thread_c'):
+            assert _rendered(output_dir, name)
+
+
+def test_failed_job_is_retried_alone():
+    """A job that cannot be sent to a worker is rendered in-process; the others are kept"""
+    generator = TimelineGenerator()
+    in_process = _render_in_process_recorder(generator)
+    
+    with tempfile.TemporaryDirectory() as output_dir:
+        batch = TimelineBatch(generator, max_workers=2)
+        batch.submit(*_make_job(output_dir, 'thread_ok'))
+        batch.submit(*_make_job(output_dir, 'thread_unpicklable', callback=lambda: None))
+        batch.submit(*_make_job(output_dir, 'thread_ok_too'))
+        results = batch.close()
+        
+        assert results == [True, True, True]
+        assert in_process == ['thread_unpicklable']
+
+
+def test_crashed_worker_is_recovered():
+    """A worker crash only re-renders the jobs it took down, and later jobs get a new pool"""
+    generator = TimelineGenerator()
+    in_process = _render_in_process_recorder(generator)
+    
+    with tempfile.TemporaryDirectory() as output_dir:
+        batch = TimelineBatch(generator, max_workers=2)
+        batch.submit(*_make_job(output_dir, 'thread_crash', crash=_CrashWorker()))
+        batch._collect(wait=True)
+        batch.submit(*_make_job(output_dir, 'thread_after'))
+        results = batch.close()
+        
+        assert results == [True, True]
+        assert in_process == ['thread_crash']
+        for name in ('thread_crash', 'thread_after'):
+            assert _rendered(output_dir, name)
+
+
+
+def test_interrupt_cancels_instead_of_rerendering():
+    """An interrupt from a worker stops the batch: nothing is re-rendered and the pool is gone"""
+    generator = TimelineGenerator()
+    in_process = _render_in_process_recorder(generator)
+    
+    with tempfile.TemporaryDirectory() as output_dir:
+        batch = TimelineBatch(generator, max_workers=1)
+        batch.submit(*_make_job(output_dir, 'thread_interrupted', thread_name=_InterruptWorker()))
+        try:
+            batch.close()
+        except KeyboardInterrupt:
+            pass
+        else:
+            raise AssertionError("close() did not re-raise the interrupt")
+        
+        assert batch.results[0] is False
+        assert in_process == []
+        assert batch._executor is None
+        assert batch.cancel() == batch.results
+
+
+if __name__ == "__main__":
+    for test in (test_batch_renders_on_pool, test_failed_job_is_retried_alone,
+                 test_crashed_worker_is_recovered, test_interrupt_cancels_instead_of_rerendering):
+        test()
+        print(f"✓ {test.__name__}")
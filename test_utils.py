@@ -0,0 +1,86 @@
+"""
+Tests for the shared thread metadata helpers
+"""
+import os
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from utils import load_json, load_folder_metadata, map_thread_folders, save_thread_metadata, parse_end_date
+
+METADATA = {
+    'email_count': 4,
+    'start_date': datetime(2025, 10, 1, 9, 30),
+    'end_date': datetime(2025, 10, 20, 17, 5),
+    'is_urgent': True,
+}
+
+
+def test_saved_metadata_has_priority_fields():
+    """The triage fields from the summary are written next to the thread metadata"""
+    summary = {
+        'priority': {'score': 75, 'priority': 'Critical', 'factors': ["Contains urgent keywords"]},
+        'conversation_insights': {'response_needed': True},
+    }
+    
+    with tempfile.TemporaryDirectory() as folder:
+        metadata_file = Path(folder) / "thread_metadata.json"
+        save_thread_metadata(metadata_file, METADATA, summary)
+        saved = load_json(metadata_file)
+    
+    assert saved['priority_score'] == 75
+    assert saved['priority_level'] == 'Critical'
+    assert saved['response_needed'] is True
+    assert saved['email_count'] == 4
+    assert parse_end_date(saved['end_date']) == METADATA['end_date']
+    # The caller's metadata keeps its datetimes
+    assert isinstance(METADATA['start_date'], datetime)
+
+
+def test_saved_metadata_priority_defaults():
+    """A summary without priority or insights gets the lowest triage values"""
+    with tempfile.TemporaryDirectory() as folder:
+        metadata_file = Path(folder) / "thread_metadata.json"
+        save_thread_metadata(metadata_file, METADATA, {})
+        saved = load_json(metadata_file)
+    
+    assert saved['priority_score'] == 0
+    assert saved['priority_level'] == 'Low'
+    assert saved['response_needed'] is False
+
+
+def test_parse_end_date():
+    """Both saved ISO strings and datetimes parse to the same datetime"""
+    end_date = datetime(2025, 10, 20, 17, 5)
+    
+    assert parse_end_date(str(end_date)) == end_date
+    assert parse_end_date(end_date.isoformat()) == end_date
+    assert parse_end_date(end_date) is end_date
+
+
+
+def test_map_thread_folders_loads_metadata_folders_only():
+    """Every thread folder with metadata is loaded; loose files and folders without metadata are skipped"""
+    with tempfile.TemporaryDirectory() as threads_dir:
+        for name, score in (("thread_a", 10), ("thread_b", 60)):
+            folder = Path(threads_dir) / name
+            folder.mkdir()
+            save_thread_metadata(folder / "thread_metadata.json", METADATA, {'priority': {'score': score}})
+        (Path(threads_dir) / "thread_empty").mkdir()
+        (Path(threads_dir) / "notes.txt").write_text("not a thread", encoding='utf-8')
+        
+        loaded = map_thread_folders(Path(threads_dir), load_folder_metadata)
+        
+        assert sorted(metadata['priority_score'] for metadata in loaded) == [10, 60]
+        assert load_folder_metadata(Path(threads_dir) / "thread_empty") is None
+
+
+if __name__ == "__main__":
+    for test in (test_saved_metadata_has_priority_fields, test_saved_metadata_priority_defaults,
+                 test_parse_end_date, test_map_thread_folders_loads_metadata_folders_only):
+        test()
+        print(f"✓ {test.__name__}")
@@ -2,25 +2,184 @@
 Thread Summarizer
 Uses HuggingFace transformers for local AI summarization (no API costs!)
 """
+import importlib.util
 import logging
-from typing import List, Dict, Optional
-import json
+from typing import List, Dict, Optional, Tuple
 import re
+import threading
+from bisect import bisect_right
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from itertools import accumulate
+from operator import itemgetter
 import config
 
 logger = logging.getLogger(__name__)
 
-# Try to import HuggingFace transformers
-try:
-    from transformers import pipeline
-    import torch
-    TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    TRANSFORMERS_AVAILABLE = False
+# Check for HuggingFace transformers without importing it; torch and transformers
+# are only imported once an AI summarizer is actually created
+TRANSFORMERS_AVAILABLE = (importlib.util.find_spec('transformers') is not None
+                          and importlib.util.find_spec('torch') is not None)
+if not TRANSFORMERS_AVAILABLE:
     logger.warning("HuggingFace transformers not available. Using fallback summarization.")
 
 
+def _keyword_pattern(keywords: List[str]) -> re.Pattern:
+    """Compile keywords into one case-insensitive alternation so a text is scanned once"""
+    return re.compile('|'.join(re.escape(kw) for kw in keywords), re.IGNORECASE)
+
+
+# Keyword matchers (one C-level pass per text instead of one substring scan per keyword);
+# timeline_generator matches greeting/signature phrases the same way
+_URGENT_PATTERN = _keyword_pattern(config.KEYWORDS_URGENT)
+_DELAY_PATTERN = _keyword_pattern(config.KEYWORDS_DELAY)
+_ISSUE_PATTERN = _keyword_pattern(
+    config.KEYWORDS_DELAY + config.KEYWORDS_URGENT + ['problem', 'issue', 'error', 'mistake', 'wrong', 'missing']
+)
+_ACTION_PATTERN = _keyword_pattern(
+    ['?', 'please', 'need', 'required', 'must', 'should', 'confirm', 'send', 'provide']
+)
+_RESPONSE_PATTERN = _keyword_pattern(['?', 'please confirm', 'can you', 'need your'])
+_QUESTION_PATTERN = _keyword_pattern(
+    ['?', 'please confirm', 'can you', 'could you', 'would you',
+     'need your', 'waiting for', 'please provide', 'please send']
+)
+# Phrases showing the thread waits on someone, in priority order
+_WAITING_PHRASES = ('waiting for', 'waiting on', 'pending', 'awaiting')
+
+# Words marking a key discussion point
+_IMPORTANT_WORDS = ('decision', 'agreed', 'confirmed', 'approved', 'rejected',
+                    'issue', 'problem', 'solution', 'action', 'deadline')
+
+_PRIORITY_EMOJI = {
+    'Critical': '🔴',
+    'High': '🟠',
+    'Medium': '🟡',
+    'Low': '🟢'
+}
+
+# Limit AI input length (BART models have max 1024 tokens)
+_MAX_AI_INPUT_CHARS = 1000
+
+# Loaded pipelines shared by every ThreadSummarizer in the process
+_PIPELINE_CACHE: Dict[tuple, object] = {}
+_PIPELINE_LOCK = threading.Lock()
+
+# Single worker: model calls run off the caller's thread but never concurrently
+_INFERENCE_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="summarizer")
+
+
+def _sentence_offsets(sentences: List[str]) -> List[int]:
+    """Start offset of each '.'-split sentence, for bisecting a match position back to its sentence"""
+    return list(accumulate((len(sent) + 1 for sent in sentences[:-1]), initial=0))
+
+
+@lru_cache(maxsize=4096)
+def _analyze_text(body: str, subject: str) -> Dict:
+    """
+    Lowercase, keyword-scan and sentence-split a single email
+    
+    Memoized on the email text so re-summarizing a thread only analyzes new emails.
+    The returned dict is shared between callers and must not be modified.
+    """
+    body_lower = body.lower()
+    sentences = body.split('.')
+
+    # Earliest issue keyword hit (in body order, not keyword-list order) that sits in a
+    # reasonably short sentence; later hits are tried when a hit's sentence is too long
+    issue_sentence = None
+    offsets = None
+    for match in _ISSUE_PATTERN.finditer(body):
+        if offsets is None:
+            offsets = _sentence_offsets(sentences)
+        # Map the hit position back to its sentence
+        sent = sentences[bisect_right(offsets, match.start()) - 1].strip()
+        if len(sent) < 200:
+            issue_sentence = sent
+            break
+
+    # One short sentence per important word
+    key_points = []
+    lower_offsets = None
+    for word in _IMPORTANT_WORDS:
+        pos = body_lower.find(word)
+        if pos < 0:
+            continue
+        if lower_offsets is None:
+            # Lowercasing can change string length, so index body_lower separately
+            lower_offsets = _sentence_offsets(body_lower.split('.'))
+        while pos >= 0:
+            index = bisect_right(lower_offsets, pos) - 1
+            sent = sentences[index].strip()
+            if len(sent) < 150:
+                key_points.append(sent)
+                break
+            # Sentence too long; look for the word from the next sentence on
+            pos = body_lower.find(word, lower_offsets[index + 1]) if index + 1 < len(lower_offsets) else -1
+
+    return {
+        'body_lower': body_lower,
+        'is_urgent': bool(_URGENT_PATTERN.search(body_lower) or _URGENT_PATTERN.search(subject)),
+        'has_delay': bool(_DELAY_PATTERN.search(body_lower) or _DELAY_PATTERN.search(subject)),
+        'issue_sentence': issue_sentence,
+        'key_points': tuple(key_points),
+    }
+
+
+@lru_cache(maxsize=4096)
+def _action_lines(body: str) -> Tuple[str, ...]:
+    """Lines of an email body that look like requests or questions (memoized per body)"""
+    return tuple(line.strip() for line in body.split('\n')
+                 if len(line) < 200 and _ACTION_PATTERN.search(line))
+
+
+def _naive(dt: datetime) -> datetime:
+    """Drop tzinfo so Outlook times compare against local datetime.now()"""
+    if getattr(dt, 'tzinfo', None) is not None:
+        return dt.replace(tzinfo=None)
+    return dt
+
+
+def _select_dtype():
+    """Pick FP16 on GPU, BF16 on CPUs with AMX support, FP32 otherwise"""
+    import torch
+    
+    if torch.cuda.is_available():
+        return torch.float16
+    try:
+        if torch.cpu._is_amx_tile_supported():
+            return torch.bfloat16
+    except AttributeError:
+        pass  # Older torch without the AMX probe
+    return torch.float32
+
+
+def _get_pipeline(model_id: str, device: int, dtype):
+    """Return the summarization pipeline for (model_id, device, dtype), loading it only once"""
+    from transformers import pipeline
+    
+    key = (model_id, device, dtype)
+    with _PIPELINE_LOCK:
+        summarizer = _PIPELINE_CACHE.get(key)
+        if summarizer is not None:
+            logger.info(f"Reusing loaded HuggingFace model: {model_id}")
+            return summarizer
+        
+        logger.info("Loading HuggingFace summarization model (first run may take a moment to download)...")
+        summarizer = pipeline(
+            "summarization",
+            model=model_id,
+            device=device,
+            torch_dtype=dtype,
+            model_kwargs={'low_cpu_mem_usage': True}
+        )
+        summarizer.model.eval()  # Inference only: no dropout
+        _PIPELINE_CACHE[key] = summarizer
+        return summarizer
+
+
 class ThreadSummarizer:
     """Summarizes email threads using HuggingFace AI or rule-based methods"""
     
@@ -36,15 +195,22 @@ class ThreadSummarizer:
         
         if self.use_ai and TRANSFORMERS_AVAILABLE:
             try:
-                logger.info("Loading HuggingFace summarization model (first run may take a moment to download)...")
-                # Use a smaller, efficient model for summarization
+                import torch
+                
+                # Use a smaller, efficient model for summarization (config.AI_MODEL)
                 # facebook/bart-large-cnn is good for summaries
                 # Alternative: sshleifer/distilbart-cnn-12-6 (smaller, faster)
-                self.summarizer = pipeline(
-                    "summarization",
-                    model="sshleifer/distilbart-cnn-12-6",  # Smaller model, faster
-                    device=0 if torch.cuda.is_available() else -1  # Use GPU if available
-                )
+                device = 0 if torch.cuda.is_available() else -1  # Use GPU if available
+                if device >= 0:
+                    # Let FP32 matmuls use TF32 tensor cores on Ampere and newer GPUs
+                    torch.backends.cuda.matmul.allow_tf32 = True
+                    torch.backends.cudnn.allow_tf32 = True
+                try:
+                    # Half precision halves memory traffic on supporting hardware
+                    self.summarizer = _get_pipeline(config.AI_MODEL, device, _select_dtype())
+                except Exception as e:
+                    logger.warning(f"Reduced-precision model load failed: {e}. Using FP32.")
+                    self.summarizer = _get_pipeline(config.AI_MODEL, device, torch.float32)
                 logger.info("HuggingFace summarizer initialized successfully")
             except Exception as e:
                 logger.warning(f"Failed to initialize HuggingFace: {e}. Using fallback.")
@@ -66,78 +232,98 @@ class ThreadSummarizer:
             Dictionary with summary and extracted information
         """
         try:
+            # Sort once; every helper below works on the chronological list
+            sorted_emails = sorted(thread_emails, key=itemgetter('received_time'))
+            now = datetime.now()
+            
             if self.use_ai and self.summarizer:
-                return self._summarize_with_ai(thread_emails, metadata)
+                return self._summarize_with_ai(sorted_emails, metadata, now)
             else:
-                return self._summarize_rule_based(thread_emails, metadata)
+                return self._summarize_rule_based(sorted_emails, metadata, now)
                 
         except Exception as e:
             logger.error(f"Error summarizing thread: {e}")
             return self._create_fallback_summary(thread_emails, metadata)
     
-    def _summarize_with_ai(self, thread_emails: List[Dict], metadata: Dict) -> Dict:
+    def _summarize_with_ai(self, sorted_emails: List[Dict], metadata: Dict, now: datetime) -> Dict:
         """Summarize using HuggingFace transformers"""
         try:
-            # Prepare thread content
-            thread_text = self._prepare_thread_text(thread_emails)
+            thread_text = self._prepare_ai_input(sorted_emails)
+            if thread_text is None:
+                logger.info(f"Thread too short for AI summary, using rule-based: {metadata['thread_name']}")
+                return self._summarize_rule_based(sorted_emails, metadata, now)
             
             # Generate summary using HuggingFace
             logger.info("Generating AI summary...")
             
-            # Limit input length (BART models have max 1024 tokens)
-            max_input_length = 1000
-            if len(thread_text) > max_input_length:
-                thread_text = thread_text[:max_input_length] + "..."
-            
-            # Generate summary
-            summary_result = self.summarizer(
-                thread_text,
-                max_length=150,
-                min_length=30,
-                do_sample=False
-            )
-            
-            ai_summary = summary_result[0]['summary_text']
-            
-            # Extract structured information using rule-based methods
-            sorted_emails = sorted(thread_emails, key=lambda x: x['received_time'])
-            events = self._extract_events(sorted_emails)
-            stakeholders = self._extract_stakeholders(sorted_emails)
-            action_items = self._extract_action_items(sorted_emails)
-            issues = self._extract_issues(sorted_emails)
-            current_status = self._determine_status(sorted_emails, metadata)
+            # Generate summary on the inference worker...
+            ai_future = _INFERENCE_EXECUTOR.submit(self._run_model, thread_text)
             
-            summary = {
-                'method': 'huggingface_ai',
-                'thread_name': metadata['thread_name'],
-                'metadata': metadata,
-                'executive_summary': ai_summary,
-                'key_events': events,
-                'stakeholders': stakeholders,
-                'action_items': action_items,
-                'current_status': current_status,
-                'issues_risks': issues
-            }
+            # ...while structured information is extracted using rule-based methods
+            summary = self._extract_for_ai_summary(sorted_emails, metadata, now)
+            summary['executive_summary'] = ai_future.result()
             
             logger.info(f"AI summary generated for thread: {metadata['thread_name']}")
             return summary
             
         except Exception as e:
             logger.error(f"AI summarization failed: {e}")
-            return self._summarize_rule_based(thread_emails, metadata)
+            return self._summarize_rule_based(sorted_emails, metadata, now)
     
-    def _summarize_rule_based(self, thread_emails: List[Dict], metadata: Dict) -> Dict:
+    def _prepare_ai_input(self, sorted_emails: List[Dict]) -> Optional[str]:
+        """Build the model input for a thread, or None if it is too short to be worth summarizing"""
+        # Prepare thread content
+        thread_text = self._prepare_thread_text(sorted_emails)
+        
+        # Too little text for the model to condense
+        if len(sorted_emails) < config.AI_MIN_EMAILS or len(thread_text) < config.AI_MIN_INPUT_CHARS:
+            return None
+        
+        # Limit input length (BART models have max 1024 tokens)
+        if len(thread_text) > _MAX_AI_INPUT_CHARS:
+            thread_text = thread_text[:_MAX_AI_INPUT_CHARS] + "..."
+        
+        return thread_text
+    
+    def _extract_for_ai_summary(self, sorted_emails: List[Dict], metadata: Dict, now: datetime) -> Dict:
+        """Build an AI summary with the rule-based fields filled in; the caller sets executive_summary"""
+        analyzed = self._analyze_emails(sorted_emails)
+        return {
+            'method': 'huggingface_ai',
+            'thread_name': metadata['thread_name'],
+            'metadata': metadata,
+            'executive_summary': None,
+            'key_events': self._extract_events(sorted_emails, analyzed),
+            'stakeholders': self._extract_stakeholders(sorted_emails),
+            'action_items': self._extract_action_items(sorted_emails),
+            'current_status': self._determine_status(sorted_emails, metadata, now),
+            'issues_risks': self._extract_issues(sorted_emails, analyzed)
+        }
+    
+    def _run_model(self, thread_text: str) -> str:
+        """Run the HuggingFace pipeline on prepared thread text"""
+        import torch
+        
+        with torch.inference_mode():
+            summary_result = self.summarizer(
+                thread_text,
+                max_length=150,
+                min_length=30,
+                do_sample=False
+            )
+        return summary_result[0]['summary_text']
+    
+    def _summarize_rule_based(self, sorted_emails: List[Dict], metadata: Dict, now: datetime) -> Dict:
         """Rule-based summarization without AI"""
         try:
-            sorted_emails = sorted(thread_emails, key=lambda x: x['received_time'])
-            
-            # Extract key information
-            events = self._extract_events(sorted_emails)
+            # Scan every email body once, then extract key information
+            analyzed = self._analyze_emails(sorted_emails)
+            events = self._extract_events(sorted_emails, analyzed)
             stakeholders = self._extract_stakeholders(sorted_emails)
             action_items = self._extract_action_items(sorted_emails)
-            issues = self._extract_issues(sorted_emails)
-            insights = self._extract_conversation_insights(sorted_emails)
-            priority = self._calculate_priority_score(sorted_emails, metadata)
+            issues = self._extract_issues(sorted_emails, analyzed)
+            insights = self._extract_conversation_insights(sorted_emails, analyzed, now)
+            priority = self._calculate_priority_score(sorted_emails, analyzed, metadata, now)
             
             # Create executive summary
             exec_summary = self._create_executive_summary(
@@ -145,7 +331,7 @@ class ThreadSummarizer:
             )
             
             # Determine current status
-            current_status = self._determine_status(sorted_emails, metadata)
+            current_status = self._determine_status(sorted_emails, metadata, now)
             
             # Generate reply template if response needed
             reply_template = self._generate_reply_template(insights, metadata)
@@ -170,25 +356,37 @@ class ThreadSummarizer:
             
         except Exception as e:
             logger.error(f"Rule-based summarization failed: {e}", exc_info=True)
-            logger.error(f"Thread: {metadata.get('thread_name', 'Unknown')}, Emails: {len(thread_emails)}")
-            return self._create_fallback_summary(thread_emails, metadata)
+            logger.error(f"Thread: {metadata.get('thread_name', 'Unknown')}, Emails: {len(sorted_emails)}")
+            return self._create_fallback_summary(sorted_emails, metadata)
     
-    def _prepare_thread_text(self, thread_emails: List[Dict]) -> str:
+    def _prepare_thread_text(self, sorted_emails: List[Dict]) -> str:
         """Prepare thread text for AI processing"""
-        sorted_emails = sorted(thread_emails, key=lambda x: x['received_time'])
-        
-        thread_text = ""
+        parts = []
+        total_len = 0
         for i, email in enumerate(sorted_emails, 1):
             date_str = email['received_time'].strftime("%Y-%m-%d %H:%M")
-            thread_text += f"Email {i} [{date_str}] From {email['sender']}: "
-            thread_text += f"{email['subject']}. "
             # Limit body to avoid token limits
             body_snippet = email['body'][:300].replace('\n', ' ').strip()
-            thread_text += f"{body_snippet}. "
+            part = f"Email {i} [{date_str}] From {email['sender']}: {email['subject']}. {body_snippet}. "
+            parts.append(part)
+            
+            # Text past the input limit is truncated anyway, so stop formatting
+            total_len += len(part)
+            if total_len > _MAX_AI_INPUT_CHARS:
+                break
         
-        return thread_text
+        return ''.join(parts)
     
-    def _extract_events(self, sorted_emails: List[Dict]) -> List[str]:
+    def _analyze_emails(self, sorted_emails: List[Dict]) -> List[Dict]:
+        """
+        Scan each email once and collect everything the extractors need
+        
+        Returns:
+            List of per-email analysis dicts, aligned with sorted_emails
+        """
+        return [_analyze_text(email['body'], email['subject']) for email in sorted_emails]
+    
+    def _extract_events(self, sorted_emails: List[Dict], analyzed: List[Dict]) -> List[str]:
         """Extract key events from emails"""
         events = []
         
@@ -208,16 +406,13 @@ class ThreadSummarizer:
                 )
         
         # Look for important keywords
-        for email in sorted_emails[1:-1]:  # Middle emails
-            body_lower = email['body'].lower()
-            subject_lower = email['subject'].lower()
-            
-            if any(kw in body_lower or kw in subject_lower for kw in config.KEYWORDS_URGENT):
+        for email, analysis in zip(sorted_emails[1:-1], analyzed[1:-1]):  # Middle emails
+            if analysis['is_urgent']:
                 events.append(
                     f"[{email['received_time'].strftime('%Y-%m-%d %H:%M')}] "
                     f"URGENT: Update from {email['sender']}"
                 )
-            elif any(kw in body_lower or kw in subject_lower for kw in config.KEYWORDS_DELAY):
+            elif analysis['has_delay']:
                 events.append(
                     f"[{email['received_time'].strftime('%Y-%m-%d %H:%M')}] "
                     f"Delay reported by {email['sender']}"
@@ -227,37 +422,24 @@ class ThreadSummarizer:
     
     def _extract_stakeholders(self, sorted_emails: List[Dict]) -> List[str]:
         """Extract stakeholders from emails"""
-        # Count participation
-        sender_counts = {}
-        for email in sorted_emails:
-            sender = email['sender']
-            sender_counts[sender] = sender_counts.get(sender, 0) + 1
-        
-        # Sort by participation
-        stakeholders = []
-        for sender, count in sorted(sender_counts.items(), key=lambda x: x[1], reverse=True):
-            stakeholders.append(f"{sender} ({count} emails)")
-        
-        return stakeholders[:10]
+        # Count participation, most active first
+        sender_counts = Counter(email['sender'] for email in sorted_emails)
+        return [f"{sender} ({count} emails)" for sender, count in sender_counts.most_common(10)]
     
     def _extract_action_items(self, sorted_emails: List[Dict]) -> List[str]:
         """Extract potential action items"""
         action_items = []
         
         # Look for question marks and action words
-        action_words = ['please', 'need', 'required', 'must', 'should', 'confirm', 'send', 'provide']
-        
         for email in sorted_emails[-3:]:  # Check last 3 emails
-            lines = email['body'].split('\n')
-            for line in lines:
-                line_lower = line.lower()
-                if '?' in line or any(word in line_lower for word in action_words):
-                    if len(line) < 200:  # Reasonable length
-                        action_items.append(line.strip())
+            action_items.extend(_action_lines(email['body']))
+            if len(action_items) >= 5:
+                break
         
         return action_items[:5]  # Limit to 5 items
     
-    def _calculate_priority_score(self, sorted_emails: List[Dict], metadata: Dict) -> Dict:
+    def _calculate_priority_score(self, sorted_emails: List[Dict], analyzed: List[Dict],
+                                  metadata: Dict, now: datetime) -> Dict:
         """
         Calculate priority score (0-100) for a thread
         Higher score = more urgent/important
@@ -275,16 +457,13 @@ class ThreadSummarizer:
         
         # Factor 2: Response needed (+25 points)
         last_email = sorted_emails[-1]
-        last_body = last_email['body'].lower()
-        if '?' in last_body or any(word in last_body for word in ['please confirm', 'can you', 'need your']):
+        last_body = analyzed[-1]['body_lower']
+        if _RESPONSE_PATTERN.search(last_body):
             score += 25
             factors.append("Response/action required")
         
         # Factor 3: Recent activity (+20 points if < 2 days)
-        received_time = last_email['received_time']
-        if hasattr(received_time, 'tzinfo') and received_time.tzinfo:
-            received_time = received_time.replace(tzinfo=None)
-        days_since_last = (datetime.now() - received_time).days
+        days_since_last = (now - _naive(last_email['received_time'])).days
         if days_since_last < 2:
             score += 20
             factors.append("Recent activity (< 2 days)")
@@ -334,7 +513,8 @@ class ThreadSummarizer:
             'factors': factors
         }
     
-    def _extract_conversation_insights(self, sorted_emails: List[Dict]) -> Dict:
+    def _extract_conversation_insights(self, sorted_emails: List[Dict], analyzed: List[Dict],
+                                       now: datetime) -> Dict:
         """Extract detailed conversation insights"""
         insights = {
             'conversation_flow': [],
@@ -351,7 +531,7 @@ class ThreadSummarizer:
         # Get last email details
         last_email = sorted_emails[-1]
         insights['last_responder'] = last_email['sender']
-        last_body = last_email['body'].lower()
+        last_body = analyzed[-1]['body_lower']
         
         # Build conversation flow (who said what)
         for email in sorted_emails[-5:]:  # Last 5 emails
@@ -369,46 +549,34 @@ class ThreadSummarizer:
             })
         
         # Check if response is needed
-        question_indicators = ['?', 'please confirm', 'can you', 'could you', 'would you', 
-                               'need your', 'waiting for', 'please provide', 'please send']
-        if any(indicator in last_body for indicator in question_indicators):
+        if _QUESTION_PATTERN.search(last_body):
             insights['response_needed'] = True
             insights['next_action'] = "Response required - question or request in last email"
         
-        # Check who we're waiting on
-        waiting_phrases = ['waiting for', 'waiting on', 'pending', 'awaiting']
-        for phrase in waiting_phrases:
-            if phrase in last_body:
+        # Check who we're waiting on (first phrase in priority order, not the leftmost hit)
+        for phrase in _WAITING_PHRASES:
+            idx = last_body.find(phrase)
+            if idx >= 0:
                 # Try to extract who we're waiting on
-                idx = last_body.find(phrase)
                 snippet = last_body[idx:idx+100]
                 insights['waiting_on'] = f"Check email: {snippet[:80]}..."
                 insights['next_action'] = "Waiting on external party"
                 break
         
-        # Extract key discussion points
-        important_words = ['decision', 'agreed', 'confirmed', 'approved', 'rejected', 
-                          'issue', 'problem', 'solution', 'action', 'deadline']
-        for email in sorted_emails:
-            body_lower = email['body'].lower()
-            for word in important_words:
-                if word in body_lower:
-                    # Find sentence with this word
-                    sentences = email['body'].split('.')
-                    for sent in sentences:
-                        if word in sent.lower() and len(sent.strip()) < 150:
-                            insights['key_points'].append(f"[{email['sender']}] {sent.strip()}")
-                            break
-        
-        # Deduplicate key points
-        insights['key_points'] = list(set(insights['key_points']))[:5]
+        # Extract the first 5 unique key discussion points
+        key_points = {}
+        for email, analysis in zip(sorted_emails, analyzed):
+            for sent in analysis['key_points']:
+                key_points[f"[{email['sender']}] {sent}"] = None
+                if len(key_points) == 5:
+                    break
+            if len(key_points) == 5:
+                break
+        insights['key_points'] = list(key_points)
         
         # Determine next action if not set
         if not insights['next_action']:
-            last_received = last_email['received_time']
-            if hasattr(last_received, 'tzinfo') and last_received.tzinfo:
-                last_received = last_received.replace(tzinfo=None)
-            days_since_last = (datetime.now() - last_received).days
+            days_since_last = (now - _naive(last_email['received_time'])).days
             if days_since_last > 7:
                 insights['next_action'] = f"Follow up - no activity for {days_since_last} days"
             elif insights['response_needed']:
@@ -456,27 +624,15 @@ class ThreadSummarizer:
         
         return template
     
-    def _extract_issues(self, sorted_emails: List[Dict]) -> List[str]:
+    def _extract_issues(self, sorted_emails: List[Dict], analyzed: List[Dict]) -> List[str]:
         """Extract potential issues or risks"""
         issues = []
         
-        issue_keywords = config.KEYWORDS_DELAY + config.KEYWORDS_URGENT + [
-            'problem', 'issue', 'error', 'mistake', 'wrong', 'missing'
-        ]
-        
-        for email in sorted_emails:
-            body_lower = email['body'].lower()
-            for keyword in issue_keywords:
-                if keyword in body_lower:
-                    # Find sentence containing keyword
-                    sentences = email['body'].split('.')
-                    for sent in sentences:
-                        if keyword in sent.lower() and len(sent.strip()) < 200:
-                            issues.append(f"[{email['received_time'].strftime('%Y-%m-%d')}] {sent.strip()}")
-                            break
-                    break
+        for email, analysis in zip(sorted_emails, analyzed):
+            if analysis['issue_sentence'] is not None:
+                issues.append(f"[{email['received_time'].strftime('%Y-%m-%d')}] {analysis['issue_sentence']}")
         
-        return list(set(issues))[:5]  # Unique, limit to 5
+        return list(dict.fromkeys(issues))[:5]  # Unique in order of appearance, limit to 5
     
     def _create_executive_summary(self, metadata: Dict, events: List[str], 
                                    stakeholders: List[str], issues: List[str]) -> str:
@@ -501,15 +657,12 @@ class ThreadSummarizer:
         
         return " ".join(summary_parts)
     
-    def _determine_status(self, sorted_emails: List[Dict], metadata: Dict) -> str:
+    def _determine_status(self, sorted_emails: List[Dict], metadata: Dict, now: datetime) -> str:
         """Determine current thread status"""
         if not sorted_emails:
             return "Unknown"
         
-        last_email_date = sorted_emails[-1]['received_time']
-        if hasattr(last_email_date, 'tzinfo') and last_email_date.tzinfo:
-            last_email_date = last_email_date.replace(tzinfo=None)
-        days_since = (datetime.now() - last_email_date).days
+        days_since = (now - _naive(sorted_emails[-1]['received_time'])).days
         
         if days_since == 0:
             status = "Active today"
@@ -529,9 +682,11 @@ class ThreadSummarizer:
         """Create minimal fallback summary"""
         # Try to get basic insights even in fallback
         try:
-            sorted_emails = sorted(thread_emails, key=lambda x: x['received_time'])
-            insights = self._extract_conversation_insights(sorted_emails)
-            priority = self._calculate_priority_score(sorted_emails, metadata)
+            sorted_emails = sorted(thread_emails, key=itemgetter('received_time'))
+            now = datetime.now()
+            analyzed = self._analyze_emails(sorted_emails)
+            insights = self._extract_conversation_insights(sorted_emails, analyzed, now)
+            priority = self._calculate_priority_score(sorted_emails, analyzed, metadata, now)
             reply_template = self._generate_reply_template(insights, metadata)
         except Exception as e:
             logger.warning(f"Error in fallback summary generation: {e}")
@@ -563,16 +718,16 @@ class ThreadSummarizer:
     
     def format_summary_markdown(self, summary: Dict) -> str:
         """Format summary as Markdown"""
-        md = f"# {summary['thread_name']}\n\n"
+        parts = [f"# {summary['thread_name']}\n\n"]
         
         # Metadata
-        md += "## Thread Information\n\n"
+        parts.append("## Thread Information\n\n")
         meta = summary['metadata']
-        md += f"- **Emails**: {meta['email_count']}\n"
-        md += f"- **Participants**: {meta['participant_count']}\n"
-        md += f"- **Date Range**: {meta['start_date']} to {meta['end_date']}\n"
-        md += f"- **Duration**: {meta['duration_days']} days\n"
-        md += f"- **Attachments**: {meta['total_attachments']}\n\n"
+        parts.append(f"- **Emails**: {meta['email_count']}\n")
+        parts.append(f"- **Participants**: {meta['participant_count']}\n")
+        parts.append(f"- **Date Range**: {meta['start_date']} to {meta['end_date']}\n")
+        parts.append(f"- **Duration**: {meta['duration_days']} days\n")
+        parts.append(f"- **Attachments**: {meta['total_attachments']}\n\n")
         
         # Flags
         flags = []
@@ -586,103 +741,98 @@ class ThreadSummarizer:
             flags.append("📋 CUSTOMS")
         
         if flags:
-            md += f"**Flags**: {' | '.join(flags)}\n\n"
+            parts.append(f"**Flags**: {' | '.join(flags)}\n\n")
         
         # Priority Score
         if 'priority' in summary:
             priority_info = summary['priority']
-            priority_emoji = {
-                'Critical': '🔴',
-                'High': '🟠',
-                'Medium': '🟡',
-                'Low': '🟢'
-            }.get(priority_info['priority'], '⚪')
+            priority_emoji = _PRIORITY_EMOJI.get(priority_info['priority'], '⚪')
             
-            md += f"## {priority_emoji} Priority: {priority_info['priority']} ({priority_info['score']}/100)\n\n"
+            parts.append(f"## {priority_emoji} Priority: {priority_info['priority']} ({priority_info['score']}/100)\n\n")
             if priority_info['factors']:
-                md += "**Priority Factors:**\n"
+                parts.append("**Priority Factors:**\n")
                 for factor in priority_info['factors']:
-                    md += f"- {factor}\n"
-                md += "\n"
+                    parts.append(f"- {factor}\n")
+                parts.append("\n")
         
         # Executive Summary
-        md += "## Executive Summary\n\n"
-        md += f"{summary['executive_summary']}\n\n"
+        parts.append("## Executive Summary\n\n")
+        parts.append(f"{summary['executive_summary']}\n\n")
         
         # Current Status
-        md += "## Current Status\n\n"
-        md += f"{summary['current_status']}\n\n"
+        parts.append("## Current Status\n\n")
+        parts.append(f"{summary['current_status']}\n\n")
         
         # Conversation Insights
         if 'conversation_insights' in summary:
             insights = summary['conversation_insights']
-            md += "## 💡 Conversation Insights\n\n"
+            parts.append("## 💡 Conversation Insights\n\n")
             
             # Response needed
             if insights['response_needed']:
-                md += "### ⚠️ Response Needed\n"
-                md += f"**Next Action**: {insights['next_action']}\n\n"
+                parts.append("### ⚠️ Response Needed\n")
+                parts.append(f"**Next Action**: {insights['next_action']}\n\n")
             else:
-                md += f"**Next Action**: {insights['next_action']}\n\n"
+                parts.append(f"**Next Action**: {insights['next_action']}\n\n")
             
             # Last responder
             if insights['last_responder']:
-                md += f"**Last Response From**: {insights['last_responder']}\n\n"
+                parts.append(f"**Last Response From**: {insights['last_responder']}\n\n")
             
             # Waiting on
             if insights['waiting_on']:
-                md += f"**Waiting On**: {insights['waiting_on']}\n\n"
+                parts.append(f"**Waiting On**: {insights['waiting_on']}\n\n")
             
             # Conversation flow
             if insights['conversation_flow']:
-                md += "### Recent Conversation Flow\n\n"
+                parts.append("### Recent Conversation Flow\n\n")
                 for msg in insights['conversation_flow']:
-                    md += f"**{msg['date']}** - {msg['sender']}\n"
-                    md += f"> {msg['preview']}\n\n"
+                    parts.append(f"**{msg['date']}** - {msg['sender']}\n")
+                    parts.append(f"> {msg['preview']}\n\n")
             
             # Key discussion points
             if insights['key_points']:
-                md += "### Key Discussion Points\n\n"
+                parts.append("### Key Discussion Points\n\n")
                 for point in insights['key_points']:
-                    md += f"- {point}\n"
-                md += "\n"
+                    parts.append(f"- {point}\n")
+                parts.append("\n")
         
         # Key Events
         if summary['key_events']:
-            md += "## Key Events\n\n"
+            parts.append("## Key Events\n\n")
             for event in summary['key_events']:
-                md += f"- {event}\n"
-            md += "\n"
+                parts.append(f"- {event}\n")
+            parts.append("\n")
         
         # Stakeholders
         if summary['stakeholders']:
-            md += "## Stakeholders\n\n"
+            parts.append("## Stakeholders\n\n")
             for stakeholder in summary['stakeholders']:
-                md += f"- {stakeholder}\n"
-            md += "\n"
+                parts.append(f"- {stakeholder}\n")
+            parts.append("\n")
         
         # Action Items
         if summary['action_items']:
-            md += "## Action Items\n\n"
+            parts.append("## Action Items\n\n")
             for item in summary['action_items']:
-                md += f"- [ ] {item}\n"
-            md += "\n"
+                parts.append(f"- [ ] {item}\n")
+            parts.append("\n")
         
         # Issues/Risks
         if summary['issues_risks']:
-            md += "## Issues & Risks\n\n"
+            parts.append("## Issues & Risks\n\n")
             for issue in summary['issues_risks']:
-                md += f"- ⚠️ {issue}\n"
-            md += "\n"
+                parts.append(f"- ⚠️ {issue}\n")
+            parts.append("\n")
         
         # Reply Template
         if 'reply_template' in summary and summary['reply_template'] != "No response required at this time.":
-            md += "## 📧 Suggested Reply Template\n\n"
-            md += "```\n"
-            md += summary['reply_template']
-            md += "\n```\n\n"
+            parts.append("## 📧 Suggested Reply Template\n\n")
+            parts.append("```\n")
+            parts.append(summary['reply_template'])
+            parts.append("\n```\n\n")
         
         # Footer
-        md += f"\n---\n*Summary generated using {summary['method']} method*\n"
+        parts.append(f"\n---\n*Summary generated using {summary['method']} method*\n")
         
-        return md
+        return ''.join(parts)
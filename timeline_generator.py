@@ -2,44 +2,200 @@
 Timeline Generator
 Creates visual timelines of email thread events
 """
+import importlib.util
 import logging
-from typing import List, Dict
-from datetime import datetime
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
 import config
 
 logger = logging.getLogger(__name__)
 
-# Try to import visualization libraries
-try:
-    import matplotlib.pyplot as plt
-    import matplotlib.dates as mdates
-    from matplotlib.patches import Rectangle
-    MATPLOTLIB_AVAILABLE = True
-except ImportError:
-    MATPLOTLIB_AVAILABLE = False
+# Check for visualization libraries without importing them; each is imported
+# inside the method that renders with it
+MATPLOTLIB_AVAILABLE = importlib.util.find_spec('matplotlib') is not None
+if not MATPLOTLIB_AVAILABLE:
     logger.warning("Matplotlib not available. Timeline visualization disabled.")
 
-try:
-    import plotly.graph_objects as go
-    import plotly.express as px
-    PLOTLY_AVAILABLE = True
-except ImportError:
-    PLOTLY_AVAILABLE = False
+PLOTLY_AVAILABLE = importlib.util.find_spec('plotly') is not None
+if not PLOTLY_AVAILABLE:
     logger.warning("Plotly not available. Interactive timeline disabled.")
 
+# Optional: plotly-resampler for downsampling very long interactive timelines
+RESAMPLER_AVAILABLE = importlib.util.find_spec('plotly_resampler') is not None
+
+_RE_WS = re.compile(r'\s+')
+
+# Deletes separator-line characters; a line that translates to '' is a rule like "-----"
+_RULE_CHARS_TABLE = str.maketrans('', '', '_ -=*#')
+
+# Interactive timeline hover text; the date is formatted through datetime.__format__
+_HOVER_TEMPLATE = "<b>{sender}</b><br>{subject}<br>{date:%Y-%m-%d %H:%M}<br><i>{body}...</i>"
+
+# Timelines with more emails than this thin out per-point labels (unreadable and slow):
+# the static timeline labels every k-th email, the interactive one drops labels and
+# switches from SVG to WebGL traces
+_MAX_LABELED_POINTS = 50
+
+# PNG zlib level for static timelines: level 3 encodes ~40% faster than the default 6
+# for somewhat larger files
+_PNG_SAVE_OPTIONS = {'compress_level': 3}
+
+# Static timelines with more emails than this draw one marker per time bucket
+_MAX_RENDERED_POINTS = 500
+
+# Interactive timelines with more emails than this are downsampled by plotly-resampler
+_RESAMPLE_MIN_POINTS = 2000
+
+# Email fields the renderers read; TimelineBatch sends only these to worker processes
+_TIMELINE_EMAIL_KEYS = ('subject', 'sender', 'received_time', 'body')
+
+# Common greeting patterns to remove
+_GREETINGS = [
+    'dear all', 'dear team', 'hi all', 'hello all', 'hi team', 'hello team',
+    'dear', 'hi', 'hello', 'good morning', 'good afternoon', 'good evening',
+    'greetings', 'hey'
+]
+
+# Common signature patterns to remove
+_SIGNATURES = [
+    'best regards', 'kind regards', 'regards', 'thank you', 'thanks',
+    'sincerely', 'cheers', 'best', 'br', 'rgds', 'thx',
+    'os melhores cumprimento', 'srdačan pozdrav', 'mit freundlichen grüßen',
+    'cordialement', 'saludos', 'atentamente'
+]
+
+
+def _phrase_matcher(phrases: List[str]):
+    """Build a test for whether a lowercased line contains any of the phrases (one regex scan per line)"""
+    pattern = re.compile('|'.join(map(re.escape, phrases)))
+    return lambda text: pattern.search(text) is not None
+
+
+_contains_greeting = _phrase_matcher(_GREETINGS)
+_contains_signature = _phrase_matcher(_SIGNATURES)
+
+
+def _sort_by_time(emails: List[Dict]) -> List[Dict]:
+    """
+    Sort emails chronologically
+    
+    Each received_time is converted to a float timestamp once, so the sort compares
+    floats instead of Outlook (pywintypes) datetime objects.
+    """
+    timestamps = [email['received_time'].timestamp() for email in emails]
+    order = sorted(range(len(emails)), key=timestamps.__getitem__)
+    return [emails[i] for i in order]
+
+
+@lru_cache(maxsize=4096)
+def _clean_body(body: str) -> str:
+    """Clean email body by removing greetings and signatures (memoized per body text)"""
+    # Split into lines
+    lines = body.split('\n')
+    cleaned_lines = []
+    
+    for line in lines:
+        line_lower = line.strip().lower()
+    
+        # Skip empty lines
+        if not line_lower:
+            continue
+    
+        # Skip greeting lines (first few lines)
+        if len(cleaned_lines) < 2:
+            is_greeting = _contains_greeting(line_lower)
+            if is_greeting and len(line_lower) < 50:
+                continue
+    
+        # Skip signature lines
+        is_signature = _contains_signature(line_lower)
+        if is_signature and len(line_lower) < 50:
+            continue
+    
+        # Skip lines with only special characters or underscores
+        if not line_lower.translate(_RULE_CHARS_TABLE):
+            continue
+    
+        cleaned_lines.append(line.strip())
+    
+    # Join and limit length
+    cleaned = ' '.join(cleaned_lines)
+    
+    # Remove multiple spaces
+    cleaned = _RE_WS.sub(' ', cleaned)
+    
+    return cleaned.strip()
+
+
+def _bucket_points(x, senders: List[str], max_points: int) -> List[Tuple[float, float, int, str]]:
+    """
+    Collapse chronological points into equal-width time buckets
+    
+    Args:
+        x: Ascending numeric (Matplotlib date) x positions as a NumPy array
+        senders: Sender of each point
+        max_points: Number of time buckets
+        
+    Returns:
+        (mean x, mean sequence position, email count, most frequent sender)
+        for each non-empty bucket
+    """
+    import numpy as np
+    
+    edges = np.linspace(x[0], x[-1], max_points + 1)
+    bucket_ids = np.minimum(np.searchsorted(edges, x, side='right') - 1, max_points - 1)
+    
+    # x is sorted, so every bucket is a contiguous run of points
+    starts = np.flatnonzero(np.r_[True, bucket_ids[1:] != bucket_ids[:-1]])
+    ends = np.r_[starts[1:], len(x)]
+    
+    return [(x[start:end].mean(), (start + end - 1) / 2, end - start,
+             Counter(senders[start:end]).most_common(1)[0][0])
+            for start, end in zip(starts, ends)]
+
+
+# A worker process's timeline generator, created once by the pool initializer
+_worker_generator = None
+
+
+def _init_timeline_worker(use_interactive: bool, fast_render: bool):
+    """Process-pool initializer: worker processes render off-screen with one generator"""
+    global _worker_generator
+    if MATPLOTLIB_AVAILABLE:
+        import matplotlib
+        matplotlib.use('Agg')
+    _worker_generator = TimelineGenerator(use_interactive=use_interactive, fast_render=fast_render)
+
+
+def _generate_timeline_job(thread_emails: List[Dict], summary: Dict, output_path: str) -> bool:
+    """Render one thread's timeline inside a worker process"""
+    return _worker_generator.generate_timeline(thread_emails, summary, output_path)
+
 
 class TimelineGenerator:
     """Generates timeline visualizations for email threads"""
     
-    def __init__(self, use_interactive: bool = False):
+    def __init__(self, use_interactive: bool = False, fast_render: bool = False):
         """
         Initialize timeline generator
         
         Args:
             use_interactive: Use Plotly for interactive timelines (if available)
+            fast_render: Render static timelines with the non-interactive Agg backend
+                at a lower DPI (for batch runs)
         """
         self.use_interactive = use_interactive and PLOTLY_AVAILABLE
         self.use_static = MATPLOTLIB_AVAILABLE
+        self.fast_render = fast_render
+        
+        if self.fast_render and self.use_static:
+            # Switch backends once, before pyplot is first imported
+            import matplotlib
+            matplotlib.use('Agg')
     
     def generate_timeline(self, thread_emails: List[Dict], summary: Dict, output_path: str) -> bool:
         """
@@ -54,60 +210,79 @@ class TimelineGenerator:
             True if successful, False otherwise
         """
         try:
+            # Sort once; every renderer works on the chronological list
+            sorted_emails = _sort_by_time(thread_emails)
+            
             if self.use_interactive:
-                return self._generate_interactive_timeline(thread_emails, summary, output_path)
+                return self._generate_interactive_timeline(sorted_emails, summary, output_path)
             elif self.use_static:
-                return self._generate_static_timeline(thread_emails, summary, output_path)
+                return self._generate_static_timeline(sorted_emails, summary, output_path)
             else:
                 logger.warning("No visualization library available")
-                return self._generate_text_timeline(thread_emails, summary, output_path)
+                return self._generate_text_timeline(sorted_emails, summary, output_path)
                 
         except Exception as e:
             logger.error(f"Error generating timeline: {e}")
             return False
     
-    def _generate_static_timeline(self, thread_emails: List[Dict], summary: Dict, output_path: str) -> bool:
+    def _generate_static_timeline(self, sorted_emails: List[Dict], summary: Dict, output_path: str) -> bool:
         """Generate static timeline using Matplotlib"""
         try:
+            import matplotlib.pyplot as plt
+            import matplotlib.dates as mdates
+            
             if not summary:
                 logger.warning("No summary provided for timeline generation")
                 return False
             
-            # Sort emails by date
-            sorted_emails = sorted(thread_emails, key=lambda x: x['received_time'])
-            
             # Prepare data
             dates = [email['received_time'] for email in sorted_emails]
             senders = [email['sender'] for email in sorted_emails]
-            subjects = [email['subject'][:50] + '...' if len(email['subject']) > 50 
-                       else email['subject'] for email in sorted_emails]
             
             # Create figure
             fig, ax = plt.subplots(figsize=(14, 8))
             
-            # Color code by sender
-            unique_senders = list(set(senders))
+            # Colors by sender, in order of first appearance so they are stable
+            unique_senders = list(dict.fromkeys(senders))
             colors = plt.cm.Set3(range(len(unique_senders)))
-            sender_colors = {sender: colors[i] for i, sender in enumerate(unique_senders)}
+            sender_colors = dict(zip(unique_senders, colors))
             
-            # Plot events
-            for i, (date, sender, subject) in enumerate(zip(dates, senders, subjects)):
-                color = sender_colors[sender]
-                
-                # Plot point
-                ax.scatter(date, i, c=[color], s=200, zorder=3, edgecolors='black', linewidth=1)
-                
-                # Add label
-                label_text = f"{sender[:20]}\n{subject[:40]}"
-                ax.text(date, i + 0.3, label_text, fontsize=8, 
+            if len(dates) > _MAX_RENDERED_POINTS:
+                # Very long threads: one marker per time bucket, its area growing with the email count
+                point_x, point_y, counts, point_senders = zip(
+                    *_bucket_points(mdates.date2num(dates), senders, _MAX_RENDERED_POINTS))
+                point_sizes = [200 * count ** 0.5 for count in counts]
+            else:
+                point_x, point_y, point_senders = dates, range(len(dates)), senders
+                point_sizes = None
+            
+            # Group point positions by sender; one single-color scatter per sender
+            # avoids per-point color mapping
+            sender_positions = {}
+            for i, sender in enumerate(point_senders):
+                sender_positions.setdefault(sender, []).append(i)
+            for sender, positions in sender_positions.items():
+                ax.scatter([point_x[i] for i in positions], [point_y[i] for i in positions],
+                          color=sender_colors[sender], zorder=3, edgecolors='black', linewidth=1,
+                          s=200 if point_sizes is None else [point_sizes[i] for i in positions])
+            
+            # Label events, at most _MAX_LABELED_POINTS of them (every k-th email on long
+            # threads); numeric x positions avoid date conversion per label
+            stride = max(1, -(-len(dates) // _MAX_LABELED_POINTS))
+            x_positions = mdates.date2num(dates[::stride])
+            for i, x in zip(range(0, len(dates), stride), x_positions):
+                email = sorted_emails[i]
+                label_text = f"{email['sender'][:20]}\n{email['subject'][:40]}"
+                ax.text(x, i + 0.3, label_text, fontsize=8, 
                        ha='left', va='bottom', wrap=True)
             
             # Draw connecting line
             ax.plot(dates, range(len(dates)), 'k-', alpha=0.3, zorder=1, linewidth=2)
             
-            # Formatting
-            ax.set_yticks(range(len(dates)))
-            ax.set_yticklabels([f"Email {i+1}" for i in range(len(dates))])
+            # Formatting; long threads tick the same every k-th email as the labels
+            tick_positions = range(0, len(dates), stride)
+            ax.set_yticks(tick_positions)
+            ax.set_yticklabels([f"Email {i+1}" for i in tick_positions])
             ax.set_xlabel('Date & Time', fontsize=12, fontweight='bold')
             ax.set_ylabel('Email Sequence', fontsize=12, fontweight='bold')
             ax.set_title(f"Timeline: {summary['thread_name']}", 
@@ -119,9 +294,9 @@ class TimelineGenerator:
             
             # Add legend
             legend_elements = [plt.Line2D([0], [0], marker='o', color='w', 
-                                         markerfacecolor=sender_colors[sender], 
+                                         markerfacecolor=colors[i], 
                                          markersize=10, label=sender[:30])
-                             for sender in unique_senders]
+                             for i, sender in enumerate(unique_senders)]
             ax.legend(handles=legend_elements, loc='upper left', fontsize=9)
             
             # Add grid
@@ -141,9 +316,16 @@ class TimelineGenerator:
             # Tight layout
             plt.tight_layout()
             
-            # Save
-            output_file = f"{output_path}.png"
-            plt.savefig(output_file, dpi=300, bbox_inches='tight')
+            # Save (SVG skips rasterizing and PNG encoding entirely)
+            if config.TIMELINE_OUTPUT_FORMAT == 'svg':
+                output_file = f"{output_path}.svg"
+                plt.savefig(output_file, bbox_inches='tight')
+            elif self.fast_render:
+                output_file = f"{output_path}.png"
+                plt.savefig(output_file, dpi=120, pil_kwargs=_PNG_SAVE_OPTIONS)
+            else:
+                output_file = f"{output_path}.png"
+                plt.savefig(output_file, dpi=300, bbox_inches='tight', pil_kwargs=_PNG_SAVE_OPTIONS)
             plt.close()
             
             logger.info(f"Static timeline saved to {output_file}")
@@ -153,58 +335,90 @@ class TimelineGenerator:
             logger.error(f"Error generating static timeline: {e}")
             return False
     
-    def _generate_interactive_timeline(self, thread_emails: List[Dict], summary: Dict, output_path: str) -> bool:
+    def _generate_interactive_timeline(self, sorted_emails: List[Dict], summary: Dict, output_path: str) -> bool:
         """Generate interactive timeline using Plotly"""
         try:
-            # Sort emails by date
-            sorted_emails = sorted(thread_emails, key=lambda x: x['received_time'])
+            import plotly.graph_objects as go
+            from plotly.colors import qualitative
             
             # Prepare data
             dates = [email['received_time'] for email in sorted_emails]
             senders = [email['sender'] for email in sorted_emails]
-            subjects = [email['subject'] for email in sorted_emails]
             
             # Create hover text
-            hover_texts = []
-            for email in sorted_emails:
-                hover_text = (f"<b>{email['sender']}</b><br>"
-                            f"{email['subject']}<br>"
-                            f"{email['received_time'].strftime('%Y-%m-%d %H:%M')}<br>"
-                            f"<i>{email['body'][:200]}...</i>")
-                hover_texts.append(hover_text)
+            hover_texts = [_HOVER_TEMPLATE.format(sender=email['sender'],
+                                                  subject=email['subject'],
+                                                  date=email['received_time'],
+                                                  body=email['body'][:200])
+                           for email in sorted_emails]
+            
+            # Very long threads embed only a downsampled view of the points
+            use_resampler = RESAMPLER_AVAILABLE and len(dates) > _RESAMPLE_MIN_POINTS
             
             # Create figure
-            fig = go.Figure()
-            
-            # Add trace for each unique sender
-            unique_senders = list(set(senders))
-            for sender in unique_senders:
-                sender_dates = [date for date, s in zip(dates, senders) if s == sender]
-                sender_indices = [i for i, s in enumerate(senders) if s == sender]
-                sender_subjects = [subjects[i] for i in sender_indices]
-                sender_hovers = [hover_texts[i] for i in sender_indices]
-                
+            if use_resampler:
+                import numpy as np
+                from plotly_resampler import FigureResampler
+                fig = FigureResampler(go.Figure())
+            else:
+                fig = go.Figure()
+            
+            # Long threads render with WebGL and without point labels to keep the browser responsive
+            use_webgl = len(dates) > _MAX_LABELED_POINTS
+            trace_type = go.Scattergl if use_webgl else go.Scatter
+            
+            # One data trace for all emails, colored per sender (trace count drives Plotly cost)
+            palette = qualitative.Plotly
+            sender_colors = {sender: palette[i % len(palette)] for i, sender in enumerate(dict.fromkeys(senders))}
+            point_colors = [sender_colors[sender] for sender in senders]
+            
+            if use_webgl:
+                label_args = dict(mode='markers')
+            else:
+                label_args = dict(mode='markers+text',
+                                  text=[f"Email {i+1}" for i in range(len(dates))],
+                                  textposition="top center")
+            
+            points = trace_type(
+                hoverinfo='text',
+                showlegend=False,
+                marker=dict(size=15, line=dict(width=2, color='DarkSlateGrey')),
+                **label_args
+            )
+            if use_resampler:
+                # plotly-resampler needs ndarrays, not lists, for its high-frequency data
+                x = np.asarray(dates)
+                y = np.arange(len(dates))
+                fig.add_trace(points, hf_x=x, hf_y=y,
+                              hf_hovertext=np.asarray(hover_texts, dtype=object),
+                              hf_marker_color=np.asarray(point_colors, dtype=object))
+            else:
+                positions = list(range(len(dates)))
+                points.update(x=dates, y=positions, hovertext=hover_texts, marker_color=point_colors)
+                fig.add_trace(points)
+            
+            # Legend entries: one empty trace per sender
+            for sender, color in sender_colors.items():
                 fig.add_trace(go.Scatter(
-                    x=sender_dates,
-                    y=sender_indices,
-                    mode='markers+text',
+                    x=[None],
+                    y=[None],
+                    mode='markers',
                     name=sender[:30],
-                    text=[f"Email {i+1}" for i in sender_indices],
-                    textposition="top center",
-                    hovertext=sender_hovers,
-                    hoverinfo='text',
-                    marker=dict(size=15, line=dict(width=2, color='DarkSlateGrey'))
+                    marker=dict(size=15, color=color, line=dict(width=2, color='DarkSlateGrey'))
                 ))
             
             # Add connecting line
-            fig.add_trace(go.Scatter(
-                x=dates,
-                y=list(range(len(dates))),
+            connector = trace_type(
                 mode='lines',
                 line=dict(color='gray', width=2, dash='dot'),
                 showlegend=False,
                 hoverinfo='skip'
-            ))
+            )
+            if use_resampler:
+                fig.add_trace(connector, hf_x=x, hf_y=y)
+            else:
+                connector.update(x=dates, y=positions)
+                fig.add_trace(connector)
             
             # Update layout
             fig.update_layout(
@@ -232,7 +446,7 @@ class TimelineGenerator:
             
             # Save
             output_file = f"{output_path}.html"
-            fig.write_html(output_file)
+            fig.write_html(output_file, include_plotlyjs=config.TIMELINE_PLOTLYJS)
             
             logger.info(f"Interactive timeline saved to {output_file}")
             return True
@@ -243,89 +457,34 @@ class TimelineGenerator:
     
     def _clean_email_body(self, body: str) -> str:
         """Clean email body by removing greetings and signatures"""
-        # Common greeting patterns to remove
-        greetings = [
-            'dear all', 'dear team', 'hi all', 'hello all', 'hi team', 'hello team',
-            'dear', 'hi', 'hello', 'good morning', 'good afternoon', 'good evening',
-            'greetings', 'hey'
-        ]
-        
-        # Common signature patterns to remove
-        signatures = [
-            'best regards', 'kind regards', 'regards', 'thank you', 'thanks',
-            'sincerely', 'cheers', 'best', 'br', 'rgds', 'thx',
-            'os melhores cumprimento', 'srdačan pozdrav', 'mit freundlichen grüßen',
-            'cordialement', 'saludos', 'atentamente'
-        ]
-        
-        # Split into lines
-        lines = body.split('\n')
-        cleaned_lines = []
-        
-        for line in lines:
-            line_lower = line.strip().lower()
-            
-            # Skip empty lines
-            if not line_lower:
-                continue
-            
-            # Skip greeting lines (first few lines)
-            if len(cleaned_lines) < 2:
-                is_greeting = any(greeting in line_lower for greeting in greetings)
-                if is_greeting and len(line_lower) < 50:
-                    continue
-            
-            # Skip signature lines
-            is_signature = any(sig in line_lower for sig in signatures)
-            if is_signature and len(line_lower) < 50:
-                continue
-            
-            # Skip lines with only special characters or underscores
-            if all(c in '_ -=*#' for c in line_lower.replace(' ', '')):
-                continue
-            
-            cleaned_lines.append(line.strip())
-        
-        # Join and limit length
-        cleaned = ' '.join(cleaned_lines)
-        
-        # Remove multiple spaces
-        import re
-        cleaned = re.sub(r'\s+', ' ', cleaned)
-        
-        return cleaned.strip()
+        return _clean_body(body)
     
-    def _generate_text_timeline(self, thread_emails: List[Dict], summary: Dict, output_path: str) -> bool:
+    def _generate_text_timeline(self, sorted_emails: List[Dict], summary: Dict, output_path: str) -> bool:
         """Generate text-based timeline (fallback)"""
         try:
-            # Sort emails by date
-            sorted_emails = sorted(thread_emails, key=lambda x: x['received_time'])
+            # Create text timeline as a list of parts, joined once
+            parts = [f"TIMELINE: {summary['thread_name']}\n", "=" * 80 + "\n\n"]
             
-            # Create text timeline
-            timeline_text = f"TIMELINE: {summary['thread_name']}\n"
-            timeline_text += "=" * 80 + "\n\n"
-            
-            for i, email in enumerate(sorted_emails, 1):
+            for email in sorted_emails:
                 date_str = email['received_time'].strftime('%Y-%m-%d %H:%M')
-                timeline_text += f"[{date_str}] {email['sender']}\n"
+                parts.append(f"[{date_str}] {email['sender']}\n")
                 
                 # Clean and add body snippet
                 cleaned_body = self._clean_email_body(email['body'])
-                body_snippet = cleaned_body[:200] if len(cleaned_body) > 200 else cleaned_body
-                timeline_text += f"{body_snippet}\n\n"
+                parts.append(f"{cleaned_body[:200]}\n\n")
             
             # Add metadata
             metadata = summary['metadata']
-            timeline_text += "=" * 80 + "\n"
-            timeline_text += f"Total Emails: {metadata['email_count']}\n"
-            timeline_text += f"Participants: {metadata['participant_count']}\n"
-            timeline_text += f"Duration: {metadata['duration_days']} days\n"
-            timeline_text += f"Attachments: {metadata['total_attachments']}\n"
+            parts.append("=" * 80 + "\n")
+            parts.append(f"Total Emails: {metadata['email_count']}\n")
+            parts.append(f"Participants: {metadata['participant_count']}\n")
+            parts.append(f"Duration: {metadata['duration_days']} days\n")
+            parts.append(f"Attachments: {metadata['total_attachments']}\n")
             
             # Save
             output_file = f"{output_path}.txt"
             with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(timeline_text)
+                f.write(''.join(parts))
             
             logger.info(f"Text timeline saved to {output_file}")
             return True
@@ -336,50 +495,59 @@ class TimelineGenerator:
     
     def generate_gantt_chart(self, thread_emails: List[Dict], summary: Dict, output_path: str) -> bool:
         """Generate Gantt-style chart showing email flow by participant"""
+        try:
+            sorted_emails = _sort_by_time(thread_emails)
+        except Exception as e:
+            logger.error(f"Error generating Gantt chart: {e}")
+            return False
+        return self._generate_gantt_chart(sorted_emails, summary, output_path)
+    
+    def _generate_gantt_chart(self, sorted_emails: List[Dict], summary: Dict, output_path: str) -> bool:
+        """Generate Gantt chart from chronologically sorted emails"""
         try:
             if not PLOTLY_AVAILABLE:
                 logger.warning("Plotly not available for Gantt chart")
                 return False
             
-            # Sort emails by date
-            sorted_emails = sorted(thread_emails, key=lambda x: x['received_time'])
-            
-            # Prepare data for Gantt chart
-            tasks = []
-            for i, email in enumerate(sorted_emails):
-                # Calculate duration to next email or end
-                start = email['received_time']
-                if i < len(sorted_emails) - 1:
-                    end = sorted_emails[i + 1]['received_time']
-                else:
-                    # Last email: add 1 hour
-                    from datetime import timedelta
-                    end = start + timedelta(hours=1)
-                
-                tasks.append(dict(
-                    Task=email['sender'][:30],
-                    Start=start,
-                    Finish=end,
-                    Resource=email['subject'][:50]
-                ))
+            import plotly.graph_objects as go
+            from plotly.colors import qualitative
+            from datetime import timedelta
+            
+            # Each bar runs until the next email; the last one gets an hour
+            starts = [email['received_time'] for email in sorted_emails]
+            ends = starts[1:] + [starts[-1] + timedelta(hours=1)]
+            tasks = [email['sender'][:30] for email in sorted_emails]
+            
+            palette = qualitative.Plotly
+            task_colors = {task: palette[i % len(palette)] for i, task in enumerate(dict.fromkeys(tasks))}
+            
+            # One horizontal bar trace for all emails instead of one trace per sender
+            fig = go.Figure(go.Bar(
+                base=starts,
+                x=[(end - start).total_seconds() * 1000 for start, end in zip(starts, ends)],
+                y=tasks,
+                orientation='h',
+                marker_color=[task_colors[task] for task in tasks],
+                customdata=[(start, end, email['subject'][:50])
+                            for start, end, email in zip(starts, ends, sorted_emails)],
+                hovertemplate=("Task=%{y}<br>Start=%{customdata[0]}<br>Finish=%{customdata[1]}"
+                               "<br>Resource=%{customdata[2]}<extra></extra>"),
+                showlegend=False
+            ))
             
-            # Create Gantt chart
-            fig = px.timeline(
-                tasks,
-                x_start="Start",
-                x_end="Finish",
-                y="Task",
-                color="Task",
-                hover_data=["Resource"],
-                title=f"Email Flow: {summary['thread_name']}"
-            )
+            # Legend entries: one empty trace per sender
+            for task, color in task_colors.items():
+                fig.add_trace(go.Bar(x=[None], y=[None], orientation='h', name=task, marker_color=color))
             
+            fig.update_xaxes(type='date')
+            fig.update_layout(title=f"Email Flow: {summary['thread_name']}", barmode='overlay',
+                              legend_title_text='Task')
             fig.update_yaxes(categoryorder="total ascending")
             fig.update_layout(height=400)
             
             # Save
             output_file = f"{output_path}_gantt.html"
-            fig.write_html(output_file)
+            fig.write_html(output_file, include_plotlyjs=config.TIMELINE_PLOTLYJS)
             
             logger.info(f"Gantt chart saved to {output_file}")
             return True
@@ -387,3 +555,116 @@ class TimelineGenerator:
         except Exception as e:
             logger.error(f"Error generating Gantt chart: {e}")
             return False
+
+
+class TimelineBatch:
+    """
+    Renders thread timelines in worker processes while the caller moves on
+    
+    Each job goes to the process pool as soon as it is submitted, and the pool stays
+    open until close(). Results are collected one future at a time: a job whose worker
+    fails is rendered again in-process, without discarding the other results. After an
+    interrupt or fatal error, cancel() drops the remaining jobs instead of waiting.
+    """
+    
+    def __init__(self, generator: TimelineGenerator, max_workers: Optional[int] = None):
+        """
+        Initialize timeline batch
+        
+        Args:
+            generator: Timeline generator whose settings the workers render with
+            max_workers: Number of worker processes (defaults to the CPU count)
+        """
+        self.generator = generator
+        self.max_workers = max_workers
+        self.results: List[bool] = []
+        self._executor = None
+        self._pending = []  # (result index, future, job)
+    
+    def submit(self, thread_emails: List[Dict], summary: Dict, output_path: str):
+        """
+        Start rendering one thread's timeline
+        
+        Args:
+            thread_emails: List of email info dictionaries
+            summary: Thread summary dictionary
+            output_path: Path to save timeline (without extension)
+        """
+        # Outlook COM items cannot be pickled; keep and send only the fields the renderers use
+        job = ([{key: email[key] for key in _TIMELINE_EMAIL_KEYS} for email in thread_emails],
+               summary, output_path)
+        index = len(self.results)
+        self.results.append(False)
+        
+        try:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=_init_timeline_worker,
+                    initargs=(self.generator.use_interactive, self.generator.fast_render))
+            future = self._executor.submit(_generate_timeline_job, *job)
+        except Exception as e:
+            # The pool could not start or is broken; the next job gets a fresh one
+            logger.error(f"Timeline worker pool unavailable, rendering in-process: {e}")
+            self._shutdown()
+            self.results[index] = self.generator.generate_timeline(*job)
+        else:
+            self._pending.append((index, future, job))
+        
+        # Record finished jobs now so their data is not held until close()
+        self._collect(wait=False)
+    
+    def close(self) -> List[bool]:
+        """
+        Wait for all submitted timelines and shut the worker pool down
+        
+        Returns:
+            Success flag per submitted job, in submission order
+        """
+        try:
+            self._collect(wait=True)
+        finally:
+            self._shutdown()
+        return self.results
+    
+    def cancel(self) -> List[bool]:
+        """
+        Drop the jobs still queued and shut the worker pool down without waiting
+        
+        Returns:
+            Success flag per submitted job, in submission order (False if not finished)
+        """
+        for index, future, job in self._pending:
+            if not future.cancel() and future.done() and future.exception() is None:
+                self.results[index] = future.result()
+        self._pending = []
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        return self.results
+    
+    def _collect(self, wait: bool):
+        """Record the results of finished jobs (of all jobs if wait is True)"""
+        pending = []
+        for index, future, job in self._pending:
+            if not wait and not future.done():
+                pending.append((index, future, job))
+                continue
+            try:
+                self.results[index] = future.result()
+            except Exception as e:
+                logger.error(f"Timeline worker failed for {job[2]}, rendering in-process: {e}")
+                if isinstance(e, BrokenProcessPool):
+                    self._shutdown()
+                self.results[index] = self.generator.generate_timeline(*job)
+            except BaseException:
+                # Interrupted (in a worker or while waiting): stop, don't re-render
+                self.cancel()
+                raise
+        self._pending = pending
+    
+    def _shutdown(self):
+        """Shut the worker pool down, if one is running"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
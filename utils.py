@@ -0,0 +1,92 @@
+"""
+Shared helpers for reading, writing and parsing thread metadata
+"""
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, List, Optional
+import config
+
+# Optional: orjson reads and writes thread metadata several times faster than json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def load_json(path: Path):
+    """Parse a JSON file (with orjson when available)"""
+    if ORJSON_AVAILABLE:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def dump_json(path: Path, data):
+    """Write data as indented UTF-8 JSON (with orjson when available)"""
+    if ORJSON_AVAILABLE:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def load_folder_metadata(thread_folder: Path) -> Optional[dict]:
+    """Read a thread folder's metadata, or None if the folder has none"""
+    try:
+        return load_json(Path(thread_folder) / config.METADATA_FILE_NAME)
+    except FileNotFoundError:
+        return None
+
+
+def map_thread_folders(threads_dir: Path, fn: Callable[[Path], Any]) -> List[Any]:
+    """
+    Apply fn to every folder in threads_dir and keep the results that are not None
+    
+    Args:
+        threads_dir: Directory holding one folder per thread
+        fn: Function called with each thread folder's path
+        
+    Returns:
+        Results in directory listing order
+    """
+    # scandir reports directory entries without a stat call per folder
+    with os.scandir(threads_dir) as entries:
+        thread_folders = [Path(entry.path) for entry in entries if entry.is_dir()]
+    
+    # Folders are independent small-file reads; overlap their I/O on a thread pool
+    with ThreadPoolExecutor(max_workers=config.METADATA_LOAD_WORKERS) as executor:
+        return [result for result in executor.map(fn, thread_folders) if result is not None]
+
+
+def save_thread_metadata(metadata_file: Path, metadata: dict, summary: dict):
+    """Write a thread's metadata, plus its triage fields from the summary"""
+    # Convert datetime objects to strings for JSON serialization
+    metadata_json = metadata.copy()
+    metadata_json['start_date'] = str(metadata_json['start_date'])
+    metadata_json['end_date'] = str(metadata_json['end_date'])
+    
+    # Triage fields, so the review loader need not parse the summary markdown
+    priority = summary.get('priority', {})
+    metadata_json['priority_score'] = priority.get('score', 0)
+    metadata_json['priority_level'] = priority.get('priority', 'Low')
+    metadata_json['response_needed'] = summary.get('conversation_insights', {}).get('response_needed', False)
+    
+    dump_json(metadata_file, metadata_json)
+
+
+def parse_end_date(end_date) -> datetime:
+    """Convert a metadata end_date (datetime or ISO string) to datetime"""
+    if not isinstance(end_date, str):
+        return end_date
+    try:
+        # Metadata dates are written with isoformat(), which the stdlib parses directly
+        return datetime.fromisoformat(end_date)
+    except ValueError:
+        from dateutil import parser
+        return parser.parse(end_date)
@@ -112,7 +112,8 @@ try:
         'has_delay': True
     }
     
-    priority = summarizer._calculate_priority_score(mock_emails, mock_metadata)
+    analyzed = summarizer._analyze_emails(mock_emails)
+    priority = summarizer._calculate_priority_score(mock_emails, analyzed, mock_metadata, now)
     print(f"   Priority Score: {priority['score']}/100")
     print(f"   Priority Level: {priority['priority']}")
     print(f"   Factors: {', '.join(priority['factors'])}")